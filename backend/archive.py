@@ -0,0 +1,359 @@
+"""
+Archive Module - Compressed Raw HTML Archive and Re-Extraction
+Keeps every scraped page body in a content-addressed, compressed store so
+an improved extractor can be re-run over past pages without the network
+"""
+
+import gzip
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from backend.extractor import ContentExtractor, pool_context
+
+try:
+    import zstandard
+except ImportError:  # optional: fall back to gzip
+    zstandard = None
+
+# File suffix per codec; the suffix decides how an object is read back
+CODECS = {"zstd": ".html.zst", "gzip": ".html.gz"}
+
+
+def _compress(body: bytes, codec: str) -> bytes:
+    """Compress a body with the given codec"""
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(body)
+    return gzip.compress(body, compresslevel=6)
+
+
+def _decompress(path: Path) -> bytes:
+    """Read and decompress an archived object"""
+    data = path.read_bytes()
+    if path.name.endswith(CODECS["zstd"]):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to read {path}")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def output_fingerprint(title: str, content: str) -> str:
+    """Hash of an extraction result, used to spot changed outputs"""
+    return hashlib.sha256(f"{title}\n{content}".encode("utf-8")).hexdigest()
+
+
+class HTMLArchive:
+    """
+    Content-addressed store of raw page bodies
+
+    Bodies live in objects/<aa>/<sha256>.html.zst (or .html.gz without the
+    zstandard package), so identical pages are stored once. A SQLite index
+    maps each URL to its latest body, encoding and a fingerprint of the
+    extraction output it produced.
+    """
+
+    def __init__(self, path: str = "data/archive", codec: Optional[str] = None):
+        """
+        Open (or create) an archive
+
+        Args:
+            path: Archive directory
+            codec: 'zstd' or 'gzip' for new objects (default: zstd if installed)
+        """
+        if codec is None:
+            codec = "zstd" if zstandard is not None else "gzip"
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec '{codec}', choose from {tuple(CODECS)}")
+        if codec == "zstd" and zstandard is None:
+            raise ValueError("codec 'zstd' needs the zstandard package")
+
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.codec = codec
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path / "index.sqlite3"), check_same_thread=False
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                object TEXT NOT NULL,
+                encoding TEXT NOT NULL,
+                output TEXT,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        encoding: str,
+        title: str = "",
+        content: str = "",
+    ) -> str:
+        """
+        Archive a page body
+
+        Args:
+            url: Canonical page URL
+            body: Raw response body
+            encoding: Codec the body was decoded with
+            title: Extracted title
+            content: Extracted article text
+
+        Returns:
+            Object path relative to the archive directory
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        relative = f"objects/{digest[:2]}/{digest}{CODECS[self.codec]}"
+        existing = self._find_object(digest)
+
+        if existing is None:
+            target = self.path / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = target.with_name(
+                f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            )
+            tmp_path.write_bytes(_compress(body, self.codec))
+            tmp_path.replace(target)
+        else:
+            relative = existing
+
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO pages (url, object, encoding, output, fetched_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    url,
+                    relative,
+                    encoding,
+                    output_fingerprint(title, content),
+                    time.time(),
+                ),
+            )
+            self._conn.commit()
+        return relative
+
+    def get(self, url: str) -> Optional[Tuple[bytes, str]]:
+        """
+        Latest archived body of a URL
+
+        Args:
+            url: Canonical page URL
+
+        Returns:
+            Tuple of (body, encoding), or None if the URL isn't archived
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT object, encoding FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return _decompress(self.path / row[0]), row[1]
+
+    def entries(self) -> List[Tuple[str, str, str, Optional[str]]]:
+        """
+        List archived pages
+
+        Returns:
+            (url, absolute object path, encoding, output fingerprint) tuples
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, object, encoding, output FROM pages ORDER BY url"
+            ).fetchall()
+        return [
+            (url, str(self.path / relative), encoding, output)
+            for url, relative, encoding, output in rows
+        ]
+
+    def set_output(self, url: str, title: str, content: str):
+        """Record the latest extraction output of an archived page"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pages SET output = ? WHERE url = ?",
+                (output_fingerprint(title, content), url),
+            )
+            self._conn.commit()
+
+    def prune(self) -> int:
+        """
+        Delete objects no URL points to any more
+
+        Returns:
+            Number of objects deleted
+        """
+        with self._lock:
+            referenced = {
+                row[0] for row in self._conn.execute("SELECT object FROM pages")
+            }
+        removed = 0
+        for path in (self.path / "objects").glob("*/*"):
+            if path.suffix == ".tmp":
+                continue
+            if str(path.relative_to(self.path)) not in referenced:
+                path.unlink()
+                removed += 1
+        return removed
+
+    def stats(self) -> Dict:
+        """
+        Get archive statistics
+
+        Returns:
+            Dict with 'pages', 'objects', 'bytes' (compressed, on disk)
+        """
+        with self._lock:
+            (pages,) = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()
+        objects = list((self.path / "objects").glob("*/*"))
+        return {
+            "pages": pages,
+            "objects": len(objects),
+            "bytes": sum(path.stat().st_size for path in objects),
+        }
+
+    def close(self):
+        """Close the index database"""
+        with self._lock:
+            self._conn.close()
+
+    def _find_object(self, digest: str) -> Optional[str]:
+        """Relative path of an already stored object, in any codec"""
+        for suffix in CODECS.values():
+            relative = f"objects/{digest[:2]}/{digest}{suffix}"
+            if (self.path / relative).exists():
+                return relative
+        return None
+
+
+def _extract_archived(
+    object_path: str, encoding: str, extractor: ContentExtractor
+) -> Tuple[Optional[Dict[str, str]], str]:
+    """
+    Process pool task: decompress and extract one archived page
+
+    Returns:
+        Tuple of (extraction, '') or (None, error message)
+    """
+    try:
+        return extractor.extract(_decompress(Path(object_path)), encoding), ""
+    except Exception as e:
+        return None, str(e)
+
+
+def reextract(
+    archive: HTMLArchive,
+    extractor: Optional[ContentExtractor] = None,
+    pipeline=None,
+    workers: Optional[int] = None,
+) -> List[Dict[str, str]]:
+    """
+    Re-run extraction over every archived page
+
+    Pages are decompressed and parsed in a process pool; only pages whose
+    title or content changed since they were last extracted are returned.
+    With a pipeline, the changed pages it already holds are re-ingested
+    incrementally; archived pages it doesn't hold (e.g. after its data was
+    cleared) are not added to it. Pages that fail to read or parse are
+    reported and skipped.
+
+    Args:
+        archive: Archive to read
+        extractor: Extractor to run (default: ContentExtractor())
+        pipeline: Optional RAGPipeline to refresh with the changed pages
+        workers: Extraction processes (default: one per CPU core)
+
+    Returns:
+        Scrape-style result dicts for pages whose output changed
+    """
+    extractor = extractor or ContentExtractor()
+    entries = archive.entries()
+    if not entries:
+        return []
+
+    workers = workers or os.cpu_count() or 1
+    changed = []
+    failed = 0
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=pool_context()
+    ) as executor:
+        outputs = executor.map(
+            _extract_archived,
+            [object_path for _, object_path, _, _ in entries],
+            [encoding for _, _, encoding, _ in entries],
+            [extractor] * len(entries),
+            chunksize=max(1, len(entries) // (workers * 4)),
+        )
+        for (url, _, _, previous), (extracted, error) in zip(entries, outputs):
+            if extracted is None:
+                failed += 1
+                print(f"⚠️ Could not re-extract {url}: {error}")
+                continue
+
+            title, content = extracted["title"], extracted["content"]
+            if output_fingerprint(title, content) == previous:
+                continue
+
+            changed.append(
+                {
+                    "url": url,
+                    "title": title,
+                    "content": content,
+                    "source_name": urlparse(url).netloc.replace("www.", ""),
+                    "success": True,
+                    "truncated": False,
+                }
+            )
+
+    print(
+        f"♻️ Re-extracted {len(entries)} archived pages, {len(changed)} changed,"
+        f" {failed} failed"
+    )
+
+    if pipeline is not None:
+        ingested = [
+            result for result in changed if result["url"] in pipeline.url_chunks
+        ]
+        if ingested:
+            pipeline.refresh_documents(ingested)
+
+    # Only remembered once ingested, so a failed refresh is retried next run
+    for result in changed:
+        archive.set_output(result["url"], result["title"], result["content"])
+    return changed
+
+
+if __name__ == "__main__":
+    # Re-extract the app's archive after an extractor change and refresh
+    # its saved vector store:
+    #   python -m backend.archive [archive_dir] [vector_store_dir]
+    from backend.embedding_cache import EmbeddingCache
+    from backend.rag_pipeline import RAGPipeline, has_saved_index
+
+    archive_dir = sys.argv[1] if len(sys.argv) > 1 else "data/archive"
+    store_dir = sys.argv[2] if len(sys.argv) > 2 else "data/vector_store"
+
+    pipeline = None
+    if has_saved_index(store_dir):
+        cache = EmbeddingCache(str(Path(store_dir).parent / "embedding_cache.sqlite3"))
+        pipeline = RAGPipeline(embedding_cache=cache)
+        pipeline.load(store_dir)
+
+    changes = reextract(HTMLArchive(archive_dir), pipeline=pipeline)
+    if pipeline is not None and changes:
+        pipeline.save(store_dir)
@@ -0,0 +1,238 @@
+"""
+Canonical URL Module - URL Canonicalization and Alias Map
+Strips tracking parameters and remembers where redirects and
+rel=canonical links lead, so every variant of an article URL maps to
+one canonical URL
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable
+from urllib.parse import unquote_plus, urldefrag, urljoin, urlparse
+
+# Query parameters that only identify the referrer or campaign
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "gclsrc",
+    "dclid",
+    "msclkid",
+    "yclid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "_hsenc",
+    "_hsmi",
+    "ocid",
+    "ref_src",
+    "cmpid",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+# Alias chains longer than this are cut short (guards against cycles)
+_MAX_HOPS = 5
+
+# Second-level labels under country codes that publishers register below
+# (news.bbc.co.uk -> bbc.co.uk); an approximation of the public suffix list
+_SECOND_LEVEL_LABELS = {"co", "com", "org", "net", "gov", "ac", "edu", "or", "ne"}
+
+
+def _is_tracking(name: str) -> bool:
+    """True for query parameters that never change the page served"""
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL without touching the network
+
+    Lowercases the scheme and host, drops the fragment, default ports and
+    tracking parameters (utm_*, fbclid, gclid, ...), and gives empty paths
+    a '/'. Other query parameters are left exactly as they were.
+
+    Args:
+        url: URL as found in a link, feed or user input
+
+    Returns:
+        Normalized URL
+    """
+    url, _ = urldefrag(url.strip())
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+
+    netloc = parsed.netloc.lower()
+    host, _, port = netloc.rpartition(":")
+    if host and _DEFAULT_PORTS.get(scheme) == port:
+        netloc = host
+
+    # Filter the raw pairs so the remaining parameters keep their encoding
+    query = "&".join(
+        pair
+        for pair in parsed.query.split("&")
+        if pair and not _is_tracking(unquote_plus(pair.partition("=")[0]))
+    )
+
+    return parsed._replace(
+        scheme=scheme,
+        netloc=netloc,
+        path=parsed.path or "/",
+        query=query,
+    ).geturl()
+
+
+def registrable_domain(host: str) -> str:
+    """
+    Domain a host was registered under (www.example.com -> example.com)
+
+    Args:
+        host: Host name without port
+
+    Returns:
+        Last two labels, or three under country-code second-level domains
+    """
+    labels = host.lower().rstrip(".").split(".")
+    if len(labels) > 2 and len(labels[-1]) == 2 and labels[-2] in _SECOND_LEVEL_LABELS:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def resolve_canonical_link(
+    page_url: str, href: str, trusted_hosts: Iterable[str] = ()
+) -> str:
+    """
+    Turn a page's rel=canonical href into a canonical URL
+
+    Relative links are resolved against the page URL. Links that aren't
+    http(s), can't be parsed, point a deep page at a site's front page (a
+    common template mistake), or point at another site are ignored. A
+    canonical on another site is only accepted if its host was part of the
+    redirect chain that served the page.
+
+    Args:
+        page_url: URL the page was served from (after redirects)
+        href: href of <link rel="canonical">, or '' if the page has none
+        trusted_hosts: Hosts the request passed through on its way to page_url
+
+    Returns:
+        Canonical URL, or the canonicalized page URL if href is unusable
+    """
+    page_url = canonicalize_url(page_url)
+    if not href:
+        return page_url
+
+    try:
+        target = canonicalize_url(urljoin(page_url, href))
+        parsed = urlparse(target)
+        host = parsed.hostname
+    except ValueError:  # e.g. an unterminated IPv6 literal
+        return page_url
+
+    if parsed.scheme not in ("http", "https") or not host:
+        return page_url
+    if parsed.path == "/" and urlparse(page_url).path != "/":
+        return page_url
+
+    page_host = urlparse(page_url).hostname or ""
+    trusted = {h.lower() for h in trusted_hosts if h}
+    if (
+        registrable_domain(host) != registrable_domain(page_host)
+        and host not in trusted
+    ):
+        return page_url
+    return target
+
+
+class CanonicalMap:
+    """
+    Persistent map from URL variants to their canonical URL
+
+    Backed by SQLite so aliases learned from redirects and rel=canonical
+    links survive restarts; a later request for any variant goes straight
+    to the canonical URL (and its cache entry).
+    """
+
+    def __init__(self, path: str = "data/canonical_map.sqlite3"):
+        """
+        Initialize alias map
+
+        Args:
+            path: SQLite database file (created if missing)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS aliases (
+                url TEXT PRIMARY KEY,
+                canonical TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def resolve(self, url: str) -> str:
+        """
+        Canonical URL for a URL
+
+        Args:
+            url: Any variant of an article URL
+
+        Returns:
+            Known canonical URL, or the normalized URL if none is recorded
+        """
+        url = canonicalize_url(url)
+        with self._lock:
+            for _ in range(_MAX_HOPS):
+                row = self._conn.execute(
+                    "SELECT canonical FROM aliases WHERE url = ?", (url,)
+                ).fetchone()
+                if row is None or row[0] == url:
+                    break
+                url = row[0]
+        return url
+
+    def record(self, variants: Iterable[str], canonical: str):
+        """
+        Remember that URLs lead to a canonical URL
+
+        Args:
+            variants: Requested and redirected URLs
+            canonical: Canonical URL they resolved to
+        """
+        canonical = canonicalize_url(canonical)
+        rows = {
+            (variant, canonical)
+            for variant in map(canonicalize_url, variants)
+            if variant != canonical
+        }
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO aliases (url, canonical) VALUES (?, ?)", rows
+            )
+            # The canonical URL is never itself an alias
+            self._conn.execute("DELETE FROM aliases WHERE url = ?", (canonical,))
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        """Number of recorded aliases"""
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM aliases").fetchone()
+        return count
+
+    def clear(self):
+        """Forget all aliases"""
+        with self._lock:
+            self._conn.execute("DELETE FROM aliases")
+            self._conn.commit()
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
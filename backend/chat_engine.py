@@ -198,7 +198,7 @@ class ChatEngine:
 
 # Test
 if __name__ == "__main__":
-    from rag_pipeline import RAGPipeline
+    from backend.rag_pipeline import RAGPipeline
 
     # Initialize RAG (no API key needed!)
     rag = RAGPipeline()
@@ -206,7 +206,14 @@ if __name__ == "__main__":
     # Sample data
     sample_data = [
         {
-            "content": "AI is transforming industries.",
+            "content": (
+                "Artificial intelligence is changing how newsrooms work. Editors"
+                " use it to sort wire copy, tag stories and suggest headlines,"
+                " while reporters rely on it to search archives and transcribe"
+                " interviews. Critics warn that the tools can repeat errors and"
+                " that readers should be told when a story was produced with"
+                " their help."
+            ),
             "url": "https://example.com",
             "title": "AI Revolution",
             "source_name": "example.com",
@@ -0,0 +1,219 @@
+"""
+Chunk Store Module - Lazily Loaded Chunk Texts and Metadata
+Keeps a saved index's chunks in SQLite, one row per FAISS row, so opening
+a save reads nothing up front and Documents are built only when retrieved
+"""
+
+import json
+import sqlite3
+import threading
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from langchain_community.docstore.base import AddableMixin, Docstore
+from langchain_core.documents import Document
+
+
+class ChunkStore(Docstore, AddableMixin):
+    """
+    Docstore of chunks by chunk id
+
+    Chunks of a saved file are read by id when looked up; chunks added or
+    deleted since are kept in memory. Saved files are never modified, so
+    processes reading the same file share its pages through the OS cache.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        article_metadata: Optional[Dict[str, Dict]] = None,
+    ):
+        """
+        Initialize chunk store
+
+        Args:
+            path: SQLite file written by write() (default: memory only)
+            article_metadata: Article metadata by URL; saved chunks share its
+                'urls' and 'sources' lists, so later duplicate merges reach them
+        """
+        self.article_metadata = article_metadata if article_metadata is not None else {}
+        self._added: Dict[str, Document] = {}
+        self._deleted = set()
+        self._lock = threading.Lock()
+        self._conn = None
+        if path is not None:
+            if not Path(path).is_file():
+                raise FileNotFoundError(f"No chunk file at {path}")
+            uri = Path(path).resolve().as_uri() + "?mode=ro&immutable=1"
+            self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+    @staticmethod
+    def write(path: str, documents: Iterable[Document]):
+        """
+        Write chunks to a new SQLite file, one row per FAISS row
+
+        Args:
+            path: File to create
+            documents: Chunks in FAISS row order
+        """
+        conn = sqlite3.connect(str(path))
+        conn.execute(
+            """
+            CREATE TABLE chunks (
+                row INTEGER PRIMARY KEY,
+                chunk_id TEXT NOT NULL UNIQUE,
+                text TEXT NOT NULL,
+                metadata TEXT NOT NULL
+            )
+            """
+        )
+        conn.executemany(
+            "INSERT INTO chunks (row, chunk_id, text, metadata) VALUES (?, ?, ?, ?)",
+            (
+                (
+                    row,
+                    doc.metadata["chunk_id"],
+                    doc.page_content,
+                    json.dumps(doc.metadata),
+                )
+                for row, doc in enumerate(documents)
+            ),
+        )
+        conn.commit()
+        conn.close()
+
+    def saved_count(self) -> int:
+        """Number of chunks in the saved file"""
+        if self._conn is None:
+            return 0
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()
+        return count
+
+    def row_ids(self) -> "SavedRowIds":
+        """FAISS row -> chunk id mapping of the saved file, read on demand"""
+        return SavedRowIds(self)
+
+    def search(self, search: str) -> Union[str, Document]:
+        """Chunk by id, or a 'not found' message (Docstore interface)"""
+        doc = self.get(search)
+        return doc if doc is not None else f"ID {search} not found."
+
+    def get(self, cid: str) -> Optional[Document]:
+        """Chunk by id, or None"""
+        if cid in self._added:
+            return self._added[cid]
+        if cid in self._deleted or self._conn is None:
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, metadata FROM chunks WHERE chunk_id = ?", (cid,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        text, metadata = row[0], json.loads(row[1])
+        article = self.article_metadata.get(metadata["url"])
+        if article is not None:
+            metadata["urls"] = article["urls"]
+            metadata["sources"] = article["sources"]
+        return Document(id=cid, page_content=text, metadata=metadata)
+
+    def add(self, texts: Dict[str, Document]):
+        """Add (or replace) chunks"""
+        self._added.update(texts)
+        self._deleted.difference_update(texts)
+
+    def delete(self, ids: List):
+        """Remove chunks"""
+        for cid in ids:
+            self._added.pop(cid, None)
+        self._deleted.update(ids)
+
+    def __contains__(self, cid: str) -> bool:
+        if cid in self._added:
+            return True
+        if cid in self._deleted or self._conn is None:
+            return False
+        with self._lock:
+            found = self._conn.execute(
+                "SELECT 1 FROM chunks WHERE chunk_id = ?", (cid,)
+            ).fetchone()
+        return found is not None
+
+    def __getitem__(self, cid: str) -> Document:
+        doc = self.get(cid)
+        if doc is None:
+            raise KeyError(cid)
+        return doc
+
+    def __setitem__(self, cid: str, doc: Document):
+        self.add({cid: doc})
+
+    def pop(self, cid: str, default=None) -> Optional[Document]:
+        """Remove a chunk and return it (default if missing)"""
+        doc = self.get(cid)
+        self.delete([cid])
+        return doc if doc is not None else default
+
+
+class SavedRowIds(Mapping):
+    """
+    Read-only FAISS row -> chunk id mapping backed by a ChunkStore file
+
+    FAISS only reads it during searches; copy it into a dict before the
+    vector store is modified.
+    """
+
+    def __init__(self, store: ChunkStore):
+        self._store = store
+        self._count = store.saved_count()
+
+    def __getitem__(self, row: int) -> str:
+        with self._store._lock:
+            found = self._store._conn.execute(
+                "SELECT chunk_id FROM chunks WHERE row = ?", (int(row),)
+            ).fetchone()
+        if found is None:
+            raise KeyError(row)
+        return found[0]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self._count))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def to_dict(self) -> Dict[int, str]:
+        """All rows in one query, as the dict FAISS needs for changes"""
+        with self._store._lock:
+            return dict(
+                self._store._conn.execute(
+                    "SELECT row, chunk_id FROM chunks ORDER BY row"
+                ).fetchall()
+            )
+
+
+class ChunkList(Sequence):
+    """Read-only list of chunks in article order, built on access"""
+
+    def __init__(self, url_chunks: Dict[str, List[str]], store: ChunkStore):
+        """
+        Initialize chunk list
+
+        Args:
+            url_chunks: Chunk ids per article URL, in article order
+            store: Store the chunks are read from
+        """
+        self._ids = [cid for ids in url_chunks.values() for cid in ids]
+        self._store = store
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._store[cid] for cid in self._ids[index]]
+        return self._store[self._ids[index]]
+
+    def __len__(self) -> int:
+        return len(self._ids)
@@ -0,0 +1,125 @@
+"""
+Circuit Breaker Module - Per-Host Failure Isolation
+Stops sending requests to a host that keeps timing out, then probes it
+again after a cool-down
+"""
+
+import threading
+import time
+from typing import Dict
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because the host's circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker for one host
+
+    closed: requests flow; consecutive failures are counted.
+    open: requests fail fast until reset_timeout has passed.
+    half_open: a single trial request is let through; success closes the
+    circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60.0):
+        """
+        Initialize circuit breaker
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to wait before a half-open trial request
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent now
+
+        Returns:
+            False if the circuit is open (or a half-open trial is running)
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = HALF_OPEN
+
+            # Half-open: only one trial at a time
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        """Record a successful request and close the circuit"""
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """Record a failed request, opening the circuit if needed"""
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def release(self):
+        """End a request that neither succeeded nor failed for the host"""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class HostCircuitBreakers:
+    """
+    Circuit breakers keyed by host
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60.0):
+        """
+        Initialize breaker registry
+
+        Args:
+            failure_threshold: Consecutive failures that open a host's circuit
+            reset_timeout: Seconds before an open circuit is probed again
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str) -> CircuitBreaker:
+        """Get or create the breaker for a host"""
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                self._breakers[host] = breaker
+            return breaker
+
+    def states(self) -> Dict[str, str]:
+        """
+        Get circuit states
+
+        Returns:
+            Dict of host -> 'closed', 'open' or 'half_open'
+        """
+        with self._lock:
+            return {host: breaker.state for host, breaker in self._breakers.items()}
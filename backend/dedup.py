@@ -0,0 +1,300 @@
+"""
+Deduplication Module - Collapse Duplicate Articles Before Embedding
+Syndicated stories and URL variants often carry identical text; each copy
+is merged into one article that remembers every URL it was found at.
+Lightly edited republications are caught with MinHash LSH.
+"""
+
+import hashlib
+import random
+import re
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+# Modulus for MinHash permutations (Mersenne prime 2^61 - 1)
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def normalize_content(text: str) -> str:
+    """Lowercase and collapse whitespace so formatting differences don't matter"""
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def content_fingerprint(text: str) -> str:
+    """
+    Hash normalized article text
+
+    Args:
+        text: Article content
+
+    Returns:
+        Hex SHA-256 digest of the normalized text
+    """
+    return hashlib.sha256(normalize_content(text).encode("utf-8")).hexdigest()
+
+
+def _choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Pick LSH (bands, rows) whose S-curve midpoint is closest to threshold
+
+    Pairs with Jaccard similarity s collide in at least one band with
+    probability 1 - (1 - s^rows)^bands, which rises steeply around
+    (1 / bands)^(1 / rows).
+    """
+    best = (1, num_perm)
+    best_error = float("inf")
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class MinHashLSH:
+    """
+    Near-duplicate index over word shingles
+
+    Each text is reduced to a MinHash signature; signatures are split into
+    bands and stored in per-band hash buckets, so a lookup only compares
+    against texts sharing a bucket instead of the whole corpus.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+        shingle_size: int = 5,
+        seed: int = 1,
+    ):
+        """
+        Initialize index
+
+        Args:
+            threshold: Estimated Jaccard similarity at which texts match
+            num_perm: Number of hash permutations in a signature
+            shingle_size: Words per shingle
+            seed: Seed for the permutation coefficients
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = _choose_bands(num_perm, threshold)
+
+        rng = random.Random(seed)
+        self._permutations = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+        self._buckets: List[Dict[Tuple, List[Hashable]]] = [
+            {} for _ in range(self.bands)
+        ]
+        self._signatures: Dict[Hashable, Tuple[int, ...]] = {}
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        """
+        Compute the MinHash signature of a text
+
+        Args:
+            text: Article content
+
+        Returns:
+            Tuple of num_perm minimum hash values
+        """
+        words = normalize_content(text).split()
+        size = self.shingle_size
+        shingles = {
+            " ".join(words[i : i + size]) for i in range(max(1, len(words) - size + 1))
+        }
+        hashes = [
+            int.from_bytes(
+                hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(),
+                "big",
+            )
+            for shingle in shingles
+        ]
+
+        return tuple(
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+            for a, b in self._permutations
+        )
+
+    def similarity(self, first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        return sum(x == y for x, y in zip(first, second)) / self.num_perm
+
+    def query(self, signature: Tuple[int, ...]) -> Optional[Hashable]:
+        """
+        Find the most similar indexed text at or above the threshold
+
+        Args:
+            signature: Signature from signature()
+
+        Returns:
+            Key of the best match, or None
+        """
+        candidates: Set[Hashable] = set()
+        for band, bucket in zip(self._bands(signature), self._buckets):
+            candidates.update(bucket.get(band, ()))
+
+        best, best_score = None, self.threshold
+        for key in candidates:
+            score = self.similarity(signature, self._signatures[key])
+            if score >= best_score:
+                best, best_score = key, score
+        return best
+
+    def insert(self, key: Hashable, signature: Tuple[int, ...]):
+        """
+        Add a text to the index
+
+        Args:
+            key: Identifier returned by query() on a match
+            signature: Signature from signature()
+        """
+        self._signatures[key] = signature
+        for band, bucket in zip(self._bands(signature), self._buckets):
+            bucket.setdefault(band, []).append(key)
+
+    def _bands(self, signature: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+        """Split a signature into its band tuples"""
+        rows = self.rows
+        return [signature[i * rows : (i + 1) * rows] for i in range(self.bands)]
+
+
+class ArticleDeduplicator:
+    """
+    Exact- and near-duplicate detection over scraped articles
+
+    Remembers every article seen since the last reset(), so duplicates
+    are caught within a batch and across batches.
+    """
+
+    def __init__(
+        self,
+        near_duplicate_threshold: Optional[float] = 0.8,
+        near_duplicate_action: str = "merge",
+    ):
+        """
+        Initialize deduplicator
+
+        Args:
+            near_duplicate_threshold: Estimated Jaccard similarity above which
+                articles count as near-duplicates (None disables the check)
+            near_duplicate_action: 'merge' to drop near-duplicates like exact
+                copies, or 'flag' to keep them marked with 'near_duplicate_of'
+        """
+        if near_duplicate_action not in ("merge", "flag"):
+            raise ValueError("near_duplicate_action must be 'merge' or 'flag'")
+
+        self.near_duplicate_threshold = near_duplicate_threshold
+        self.near_duplicate_action = near_duplicate_action
+        self.reset()
+
+    def deduplicate(self, scraped_data: List[Dict]) -> List[Dict]:
+        """
+        Drop articles whose content was already seen
+
+        Every kept article gets 'urls' and 'source_names' lists; later
+        copies append their URL and source to the article they duplicate.
+        Flagged near-duplicates are kept with 'near_duplicate_of' set to
+        the URL of the article they resemble.
+
+        Args:
+            scraped_data: Successful scrape results with 'content', 'url', 'source_name'
+
+        Returns:
+            Articles not seen before, in input order
+        """
+        unique = []
+        for data in scraped_data:
+            fingerprint = content_fingerprint(data["content"])
+            original = self._articles.get(fingerprint)
+
+            if original is not None:
+                self.duplicates_skipped += 1
+                self._merge(original, data)
+                continue
+
+            article = dict(data)
+            article["urls"] = [data["url"]]
+            article["source_names"] = [data["source_name"]]
+
+            if self._lsh is not None:
+                signature = self._lsh.signature(data["content"])
+                match = self._lsh.query(signature)
+
+                if match is not None and self.near_duplicate_action == "merge":
+                    self.near_duplicates_skipped += 1
+                    self._merge(self._articles[match], data)
+                    continue
+
+                if match is not None:
+                    self.near_duplicates_flagged += 1
+                    article["near_duplicate_of"] = self._articles[match]["url"]
+                else:
+                    self._lsh.insert(fingerprint, signature)
+
+            self._articles[fingerprint] = article
+            unique.append(article)
+
+        return unique
+
+    def state(self) -> Dict:
+        """
+        JSON-serializable snapshot of the seen articles, for restore()
+
+        Article text is left out; only what later merges need is kept.
+        """
+        return {
+            "articles": {
+                fingerprint: {
+                    "url": article["url"],
+                    "urls": article["urls"],
+                    "source_names": article["source_names"],
+                }
+                for fingerprint, article in self._articles.items()
+            },
+            "signatures": (
+                {key: list(sig) for key, sig in self._lsh._signatures.items()}
+                if self._lsh is not None
+                else {}
+            ),
+        }
+
+    def restore(self, state: Dict):
+        """
+        Replace seen articles with a snapshot from state()
+
+        Args:
+            state: Dict returned by state()
+        """
+        self.reset()
+        self._articles = {
+            fingerprint: dict(article)
+            for fingerprint, article in state["articles"].items()
+        }
+        if self._lsh is not None:
+            for key, signature in state["signatures"].items():
+                self._lsh.insert(key, tuple(signature))
+
+    def reset(self):
+        """Forget all previously seen articles"""
+        self._articles: Dict[str, Dict] = {}
+        self._lsh = (
+            MinHashLSH(threshold=self.near_duplicate_threshold)
+            if self.near_duplicate_threshold
+            else None
+        )
+        self.duplicates_skipped = 0
+        self.near_duplicates_skipped = 0
+        self.near_duplicates_flagged = 0
+
+    def _merge(self, original: Dict, duplicate: Dict):
+        """Record a duplicate's URL and source on the article it copies"""
+        if duplicate["url"] not in original["urls"]:
+            original["urls"].append(duplicate["url"])
+        if duplicate["source_name"] not in original["source_names"]:
+            original["source_names"].append(duplicate["source_name"])
@@ -0,0 +1,228 @@
+"""
+Embedding Cache Module - Persistent Content-Addressed Embedding Cache
+Stores chunk vectors by (model, text hash) in SQLite so text that was
+embedded before never goes back to the embedding model
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, List
+
+from langchain_core.embeddings import Embeddings
+
+
+def text_key(text: str) -> str:
+    """Hex SHA-256 of a text, the cache key within a model"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    On-disk vector cache backed by SQLite
+
+    Vectors are stored as float32 blobs. Entries are evicted least
+    recently used first once the stored vectors exceed max_bytes.
+    """
+
+    def __init__(
+        self, path: str = "data/embedding_cache.sqlite3", max_bytes: int = 500_000_000
+    ):
+        """
+        Initialize cache
+
+        Args:
+            path: SQLite database file (created if missing)
+            max_bytes: Size cap for stored vectors
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS vectors (
+                model TEXT NOT NULL,
+                key TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (model, key)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS vectors_last_access ON vectors (last_access)"
+        )
+        self._conn.commit()
+        (self._bytes,) = self._conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM vectors"
+        ).fetchone()
+
+    def get_many(self, model: str, keys: List[str]) -> Dict[str, List[float]]:
+        """
+        Look up cached vectors
+
+        Args:
+            model: Embedding model name
+            keys: Text keys from text_key()
+
+        Returns:
+            Dict of key -> vector for the keys that are cached
+        """
+        found = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start : start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM vectors WHERE model = ? AND key IN ({placeholders})",
+                    [model, *batch],
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+
+            now = time.time()
+            self._conn.executemany(
+                "UPDATE vectors SET last_access = ? WHERE model = ? AND key = ?",
+                [(now, model, key) for key in found],
+            )
+            self._conn.commit()
+
+            self.hits += len(found)
+            self.misses += len(set(keys)) - len(found)
+        return found
+
+    def put_many(self, model: str, vectors: Dict[str, List[float]]):
+        """
+        Store vectors
+
+        Args:
+            model: Embedding model name
+            vectors: Dict of text key -> vector
+        """
+        now = time.time()
+        rows = [
+            (model, key, array("f", vector).tobytes(), now)
+            for key, vector in vectors.items()
+        ]
+        with self._lock:
+            for model_name, key, blob, _ in rows:
+                old = self._conn.execute(
+                    "SELECT LENGTH(vector) FROM vectors WHERE model = ? AND key = ?",
+                    (model_name, key),
+                ).fetchone()
+                self._bytes += len(blob) - (old[0] if old else 0)
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO vectors (model, key, vector, last_access)
+                VALUES (?, ?, ?, ?)
+                """,
+                rows,
+            )
+            self._evict()
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        """
+        Get cache statistics
+
+        Returns:
+            Dict with 'hits', 'misses', 'hit_rate', 'entries', 'bytes'
+        """
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM vectors").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": entries,
+                "bytes": self._bytes,
+            }
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._conn.execute("DELETE FROM vectors")
+            self._conn.commit()
+            self._bytes = 0
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self):
+        """Drop least recently used vectors until under max_bytes (lock held)"""
+        while self._bytes > self.max_bytes:
+            rows = self._conn.execute(
+                """
+                SELECT model, key, LENGTH(vector) FROM vectors
+                ORDER BY last_access ASC LIMIT 256
+                """
+            ).fetchall()
+            if not rows:
+                self._bytes = 0
+                return
+
+            stale = []
+            for model, key, size in rows:
+                if self._bytes <= self.max_bytes:
+                    break
+                stale.append((model, key))
+                self._bytes -= size
+            self._conn.executemany(
+                "DELETE FROM vectors WHERE model = ? AND key = ?", stale
+            )
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that consults an EmbeddingCache before the model
+
+    Only document texts missing from the cache are sent to the wrapped
+    embeddings, each distinct text once per call. Queries bypass the cache.
+    """
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache, model: str):
+        """
+        Initialize cached embeddings
+
+        Args:
+            embeddings: Embeddings that compute missing vectors
+            cache: Vector store shared across pipelines
+            model: Model name the vectors belong to (part of the cache key)
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model = model
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts, computing only the ones not cached"""
+        keys = [text_key(text) for text in texts]
+        vectors = self.cache.get_many(self.model, keys)
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                missing.setdefault(key, text)
+
+        if missing:
+            computed = self.embeddings.embed_documents(list(missing.values()))
+            fresh = dict(zip(missing, computed))
+            self.cache.put_many(self.model, fresh)
+            vectors.update(fresh)
+
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query directly; questions are one-offs, not worth caching"""
+        return self.embeddings.embed_query(text)
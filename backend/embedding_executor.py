@@ -0,0 +1,105 @@
+"""
+Embedding Executor Module - Batched, Concurrent Embedding Requests
+Splits large embedding jobs into fixed-size batches and keeps several of
+them in flight, so ingest throughput isn't bound by one request at a time
+"""
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+
+class EmbeddingExecutor(Embeddings):
+    """
+    Embeddings wrapper that sends texts in concurrent batches
+
+    Failed batches are retried with jittered exponential backoff; a batch
+    that still fails after max_retries fails the whole call. Results come
+    back in input order.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        batch_size: int = 32,
+        concurrency: int = 4,
+        max_retries: int = 2,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ):
+        """
+        Initialize embedding executor
+
+        Args:
+            embeddings: Embeddings that serve each batch (e.g. OllamaEmbeddings)
+            batch_size: Texts per request
+            concurrency: Batches in flight at once; match the server's
+                parallelism (OLLAMA_NUM_PARALLEL for Ollama)
+            max_retries: Retries per failed batch
+            backoff_base: First retry waits up to this many seconds
+            backoff_max: Upper bound for a single backoff wait
+            progress_callback: Called as (texts embedded, total texts) after
+                each batch, from the thread that called embed_documents
+        """
+        self.embeddings = embeddings
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.progress_callback = progress_callback
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts in concurrent batches, preserving order"""
+        if not texts:
+            return []
+
+        starts = range(0, len(texts), self.batch_size)
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+        done = 0
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.concurrency, len(starts))
+        ) as executor:
+            futures = {
+                executor.submit(
+                    self._embed_batch, texts[start : start + self.batch_size]
+                ): start
+                for start in starts
+            }
+            try:
+                for future in as_completed(futures):
+                    batch = future.result()
+                    start = futures[future]
+                    vectors[start : start + len(batch)] = batch
+
+                    done += len(batch)
+                    if self.progress_callback is not None:
+                        self.progress_callback(done, len(texts))
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query directly; a single text gains nothing from batching"""
+        return self.embeddings.embed_query(text)
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed one batch, retrying failures"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.embeddings.embed_documents(texts)
+            except Exception:
+                # Ollama surfaces timeouts, dropped connections and model
+                # reloads as different exception types; retry them all
+                if attempt == self.max_retries:
+                    raise
+                delay = random.uniform(0, self.backoff_base * 2**attempt)
+                time.sleep(min(delay, self.backoff_max))
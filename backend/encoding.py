@@ -0,0 +1,113 @@
+"""
+Encoding Module - Cheap Charset Detection for Scraped Pages
+Picks a page's encoding from the HTTP header, a byte order mark or a
+<meta> declaration, without statistical detection over the whole body
+"""
+
+import codecs
+import re
+from typing import Optional, Tuple
+
+# Byte order marks, longest first so UTF-32 isn't mistaken for UTF-16
+BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+# Browsers treat these labels as windows-1252 (WHATWG Encoding Standard)
+WINDOWS_1252_ALIASES = {
+    "iso-8859-1",
+    "iso8859-1",
+    "latin1",
+    "latin-1",
+    "us-ascii",
+    "ascii",
+}
+
+# <meta charset="..."> or <meta http-equiv="Content-Type" content="...; charset=...">
+_META_CHARSET = re.compile(
+    rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_:.-]+)""", re.IGNORECASE
+)
+_HEADER_CHARSET = re.compile(r"""charset\s*=\s*["']?([^"';\s]+)""", re.IGNORECASE)
+
+DEFAULT_ENCODING = "utf-8"
+
+
+def normalize_encoding(label: str) -> Optional[str]:
+    """
+    Map an encoding label to a Python codec name
+
+    Args:
+        label: Encoding label from a header or document
+
+    Returns:
+        Codec name, or None if Python doesn't know the label
+    """
+    label = label.strip().lower()
+    if label in WINDOWS_1252_ALIASES:
+        return "cp1252"
+    try:
+        return codecs.lookup(label).name
+    except LookupError:
+        return None
+
+
+def detect_encoding(
+    content_type: str, body: bytes, sniff_bytes: int = 4096
+) -> Tuple[str, str]:
+    """
+    Pick a page's encoding in a fixed, cheap order
+
+    1. charset parameter of the Content-Type header
+    2. byte order mark
+    3. <meta charset> in the first sniff_bytes of the body
+    4. UTF-8
+
+    Args:
+        content_type: Content-Type response header (may be empty)
+        body: Raw response body
+        sniff_bytes: How much of the body to search for a <meta> declaration
+
+    Returns:
+        Tuple of (codec name, source) where source is 'header', 'bom',
+        'meta' or 'default'
+    """
+    match = _HEADER_CHARSET.search(content_type or "")
+    if match:
+        encoding = normalize_encoding(match.group(1))
+        if encoding:
+            return encoding, "header"
+
+    for bom, encoding in BOMS:
+        if body.startswith(bom):
+            return encoding, "bom"
+
+    match = _META_CHARSET.search(body[:sniff_bytes])
+    if match:
+        encoding = normalize_encoding(match.group(1).decode("ascii", "ignore"))
+        # A page can't be UTF-16 if its ASCII <meta> tag was readable
+        if encoding and not encoding.startswith("utf-16"):
+            return encoding, "meta"
+
+    return DEFAULT_ENCODING, "default"
+
+
+def decode_body(body: bytes, encoding: str) -> str:
+    """
+    Decode a body once, dropping any BOM and replacing invalid bytes
+
+    Args:
+        body: Raw response body
+        encoding: Codec name from detect_encoding()
+
+    Returns:
+        Decoded text
+    """
+    for bom, bom_encoding in BOMS:
+        if body.startswith(bom) and codecs.lookup(bom_encoding).name == encoding:
+            body = body[len(bom) :]
+            break
+    return body.decode(encoding, errors="replace")
@@ -0,0 +1,452 @@
+"""
+Content Extraction Module - HTML Parsing and Article Extraction
+Turns raw HTML into a title and main article text
+"""
+
+import multiprocessing
+import re
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from typing import Dict, List, Optional, Tuple, Union
+from backend.encoding import decode_body, detect_encoding
+
+# BeautifulSoup tree builders, fastest first
+PARSERS = ("lxml", "html.parser", "html5lib")
+
+# Content extraction strategies
+STRATEGIES = ("cascade", "density")
+
+# Containers _extract_by_cascade looks inside
+CONTENT_CLASSES = ["main-content", "article-content", "post-content", "entry-content"]
+
+# Page chrome removed before looking for article text
+CHROME_TAGS = ["script", "style", "nav", "header", "footer", "aside"]
+
+# Tags kept when parsing is restricted: everything title/content extraction
+# reads, plus page chrome so its paragraphs are still discarded
+RESTRICTED_TAGS = {
+    "title",
+    "h1",
+    "meta",
+    "link",
+    "article",
+    "main",
+    "p",
+    "nav",
+    "header",
+    "footer",
+    "aside",
+}
+
+
+# Tags specific enough to be learned as a selector without an id or class
+BARE_SELECTOR_TAGS = ("article", "main")
+
+# Tags still needed when parsing is limited to a learned container
+SELECTOR_TAGS = {"title", "h1", "meta", "link"}
+
+# Selectors this module writes: tag, tag#id or tag.class.class
+_SELECTOR = re.compile(r"^([a-z][a-z0-9]*)(?:#([\w-]+)|((?:\.[\w-]+)+))?$")
+_SELECTOR_TOKEN = re.compile(r"^[A-Za-z_-][\w-]*$")
+
+
+def _name_and_attrs(tag, attrs):
+    """
+    Normalize SoupStrainer callback arguments
+
+    Older BeautifulSoup versions call rules with (name, attrs), newer ones
+    with the Tag itself.
+    """
+    if attrs is None and hasattr(tag, "name"):
+        return tag.name, tag.attrs
+    return tag, attrs or {}
+
+
+class _RuleStrainer(SoupStrainer):
+    """
+    SoupStrainer that hands each tag's name and attributes to a rule
+
+    BeautifulSoup 4.13+ only passes the tag name to a callable rule while
+    parsing, so attribute checks (classes, ids) would never match; its
+    allow_tag_creation() hook receives both. Older versions never call
+    the hook and pass (name, attrs) to the rule themselves.
+    """
+
+    def __init__(self, rule):
+        super().__init__(rule)
+        self.rule = rule
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        return self.rule(name, attrs or {})
+
+
+def _classes(attrs) -> List[str]:
+    """Class list from a tag's attributes"""
+    classes = attrs.get("class") or []
+    if isinstance(classes, str):
+        classes = classes.split()
+    return classes
+
+
+def _restricted_match(tag, attrs=None) -> bool:
+    """SoupStrainer rule for restricted parsing"""
+    name, attrs = _name_and_attrs(tag, attrs)
+
+    if name in RESTRICTED_TAGS:
+        return True
+
+    if name == "div":
+        return any(cls in CONTENT_CLASSES for cls in _classes(attrs))
+
+    return False
+
+
+def _selector_match(selector: str):
+    """
+    SoupStrainer rule keeping a learned container and the title tags
+
+    Args:
+        selector: Selector from selector_for()
+
+    Returns:
+        Rule function, or None if the selector isn't one this module writes
+    """
+    match = _SELECTOR.match(selector)
+    if not match:
+        return None
+    tag_name, tag_id, class_part = match.groups()
+    wanted = set(class_part[1:].split(".")) if class_part else set()
+
+    def rule(tag, attrs=None) -> bool:
+        name, attrs = _name_and_attrs(tag, attrs)
+        if name in SELECTOR_TAGS:
+            return True
+        if name != tag_name:
+            return False
+        if tag_id:
+            return attrs.get("id") == tag_id
+        return wanted.issubset(_classes(attrs))
+
+    return rule
+
+
+def selector_for(element: Optional[Tag]) -> str:
+    """
+    Describe a content container as a simple CSS selector
+
+    Ids and classes containing digits are skipped, since they usually
+    differ from article to article. A tag without a usable id or class is
+    only described for BARE_SELECTOR_TAGS; a bare 'div' would match the
+    page's first div rather than the container.
+
+    Args:
+        element: Container the article text was taken from
+
+    Returns:
+        'tag', 'tag#id' or 'tag.class...', or '' for no usable container
+    """
+    if element is None or element.name in (None, "[document]", "html", "body"):
+        return ""
+
+    tag_id = element.get("id") or ""
+    if _SELECTOR_TOKEN.match(tag_id) and not any(c.isdigit() for c in tag_id):
+        return f"{element.name}#{tag_id}"
+
+    classes = [
+        cls
+        for cls in _classes(element.attrs)
+        if _SELECTOR_TOKEN.match(cls) and not any(c.isdigit() for c in cls)
+    ]
+    if not classes and element.name not in BARE_SELECTOR_TAGS:
+        return ""
+    return element.name + "".join(f".{cls}" for cls in classes)
+
+
+def pool_context():
+    """
+    Start method for extraction process pools
+
+    Workers are started from a clean server process (or spawned) rather
+    than forked, since forking a multithreaded process such as the
+    Streamlit server can copy held locks into the child.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+class ContentExtractor:
+    """
+    Parses HTML with a selectable backend and extracts article content
+    """
+
+    def __init__(
+        self, parser: str = "lxml", restrict: bool = False, strategy: str = "cascade"
+    ):
+        """
+        Initialize extractor
+
+        Args:
+            parser: BeautifulSoup tree builder ('lxml', 'html.parser', 'html5lib')
+            restrict: Only build the subtrees extraction reads (faster, less
+                memory); cascade strategy only
+            strategy: 'cascade' (article/main/all paragraphs) or 'density'
+                (best block by text and link density)
+        """
+        if parser not in PARSERS:
+            raise ValueError(f"Unknown parser '{parser}', choose from {PARSERS}")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy '{strategy}', choose from {STRATEGIES}")
+        if restrict and strategy == "density":
+            # Restricted parsing drops the plain <div> blocks density scores
+            raise ValueError("restrict=True only works with the 'cascade' strategy")
+
+        self.parser = parser
+        self.restrict = restrict
+        self.strategy = strategy
+
+    def parse(
+        self,
+        html: Union[str, bytes],
+        encoding: Optional[str] = None,
+        selector: Optional[str] = None,
+    ) -> BeautifulSoup:
+        """
+        Parse HTML into a soup
+
+        Bytes are handed to lxml undecoded with the known encoding so it
+        decodes them in C; other backends get the body decoded exactly
+        once. Either way BeautifulSoup never has to guess the encoding.
+
+        Args:
+            html: Page markup, as text or raw bytes
+            encoding: Codec for raw bytes (sniffed from the markup if None)
+            selector: Only build this container and the title tags
+
+        Returns:
+            Parsed BeautifulSoup tree (partial if restrict or selector is set)
+        """
+        rule = _selector_match(selector) if selector else None
+        if rule is None and self.restrict:
+            rule = _restricted_match
+        parse_only = _RuleStrainer(rule) if rule else None
+
+        if isinstance(html, bytes):
+            if encoding is None:
+                encoding, _ = detect_encoding("", html)
+            if self.parser == "lxml":
+                return BeautifulSoup(
+                    html, self.parser, from_encoding=encoding, parse_only=parse_only
+                )
+            html = decode_body(html, encoding)
+
+        return BeautifulSoup(html, self.parser, parse_only=parse_only)
+
+    def extract(
+        self,
+        html: Union[str, bytes],
+        encoding: Optional[str] = None,
+        selector: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """
+        Parse HTML and extract title and main content
+
+        With a selector (learned for the page's domain) only that
+        container is parsed and read; if it is missing or holds no
+        substantial paragraphs the page goes through the generic path.
+
+        Args:
+            html: Page markup, as text or raw bytes
+            encoding: Codec for raw bytes (sniffed from the markup if None)
+            selector: Container selector to try first
+
+        Returns:
+            Dict with 'title', 'content', 'canonical' (href of the page's
+            canonical link, '' if it has none) and 'selector' (container
+            the content came from, '' if none)
+        """
+        if selector:
+            soup = self.parse(html, encoding, selector=selector)
+            container = soup.select_one(selector)
+            if container is not None:
+                content = self._container_text(container)
+                if content:
+                    return {
+                        "title": self.extract_title(soup),
+                        "content": content,
+                        "canonical": self.extract_canonical(soup),
+                        "selector": selector,
+                    }
+
+        soup = self.parse(html, encoding)
+        title = self.extract_title(soup)
+        canonical = self.extract_canonical(soup)
+        content, container = self.locate_content(soup)
+
+        # Only report a selector that finds this very container again
+        learned = selector_for(container) if content else ""
+        if learned and soup.select_one(learned) is not container:
+            learned = ""
+        return {
+            "title": title,
+            "content": content,
+            "canonical": canonical,
+            "selector": learned,
+        }
+
+    def extract_title(self, soup: BeautifulSoup) -> str:
+        """Extract page title with fallbacks"""
+        # Try multiple title sources
+        title_tags = [
+            soup.find("h1"),
+            soup.find("title"),
+            soup.find("meta", property="og:title"),
+        ]
+
+        for tag in title_tags:
+            if tag:
+                if tag.name == "meta":
+                    return tag.get("content", "Unknown Title")
+                return tag.get_text().strip()
+
+        return "Unknown Title"
+
+    def extract_canonical(self, soup: BeautifulSoup) -> str:
+        """Extract the rel=canonical href, falling back to og:url"""
+        for link in soup.find_all("link", href=True):
+            rel = link.get("rel") or []
+            if isinstance(rel, str):
+                rel = rel.split()
+            if "canonical" in (value.lower() for value in rel):
+                return link["href"].strip()
+
+        og_url = soup.find("meta", property="og:url")
+        if og_url and og_url.get("content"):
+            return og_url["content"].strip()
+
+        return ""
+
+    def extract_content(self, soup: BeautifulSoup) -> str:
+        """
+        Extract main content with the configured strategy
+        """
+        content, _ = self.locate_content(soup)
+        return content
+
+    def locate_content(self, soup: BeautifulSoup) -> Tuple[str, Optional[Tag]]:
+        """
+        Extract main content and the container it was found in
+
+        Returns:
+            Tuple of (content, container element or None)
+        """
+        # Remove unwanted elements
+        for element in soup(CHROME_TAGS):
+            element.decompose()
+
+        if self.strategy == "density":
+            return self._extract_by_density(soup)
+        return self._extract_by_cascade(soup)
+
+    def _container_text(self, container: Tag) -> str:
+        """Article text inside a known container"""
+        for element in container(CHROME_TAGS):
+            element.decompose()
+
+        texts = []
+        for p in container.find_all("p"):
+            text = p.get_text().strip()
+            if len(text) <= 50:
+                continue
+            # Match the density strategy, which skips link lists
+            if self.strategy == "density" and _link_density(p, text) >= 0.5:
+                continue
+            texts.append(text)
+        return "\n\n".join(texts)
+
+    def _extract_by_cascade(self, soup: BeautifulSoup) -> Tuple[str, Optional[Tag]]:
+        """
+        Extract main content with intelligent parsing
+        Tries multiple strategies to find article content
+        """
+        # Strategy 1: Look for article tag
+        article = soup.find("article")
+        if article:
+            paragraphs = article.find_all("p")
+            if paragraphs:
+                return "\n\n".join(_substantial_texts(paragraphs)), article
+
+        # Strategy 2: Look for main content div
+        main_content = soup.find("main") or soup.find(
+            "div",
+            class_=CONTENT_CLASSES,
+        )
+        if main_content:
+            paragraphs = main_content.find_all("p")
+            if paragraphs:
+                return "\n\n".join(_substantial_texts(paragraphs)), main_content
+
+        # Strategy 3: Get all paragraphs (fallback)
+        paragraphs = soup.find_all("p")
+        if paragraphs:
+            # Filter out short paragraphs (likely navigation/ads)
+            content_paras = _substantial_texts(paragraphs)
+            return (
+                "\n\n".join(content_paras[:20]),
+                None,
+            )  # Limit to first 20 substantial paragraphs
+
+        return "Could not extract content from this page.", None
+
+    def _extract_by_density(self, soup: BeautifulSoup) -> Tuple[str, Optional[Tag]]:
+        """
+        Extract the block with the most link-free paragraph text
+
+        Every paragraph is visited once. Its text length, discounted by its
+        link density, is credited to its parent and (at half weight) its
+        grandparent; the highest scoring block wins and its substantial
+        paragraphs are returned in document order.
+        """
+        scores = {}
+        blocks = {}
+        block_paragraphs = {}
+
+        for p in soup.find_all("p"):
+            text = p.get_text().strip()
+            if not text:
+                continue
+
+            link_density = _link_density(p, text)
+            score = len(text) * (1.0 - link_density)
+
+            parent = p.parent
+            grandparent = parent.parent if parent is not None else None
+            for block, weight in ((parent, 1.0), (grandparent, 0.5)):
+                if block is None:
+                    continue
+                key = id(block)
+                blocks[key] = block
+                scores[key] = scores.get(key, 0.0) + score * weight
+                block_paragraphs.setdefault(key, []).append((text, link_density))
+
+        if not scores:
+            return "Could not extract content from this page.", None
+
+        best = max(scores, key=scores.get)
+        content = "\n\n".join(
+            text
+            for text, link_density in block_paragraphs[best]
+            if len(text) > 50 and link_density < 0.5
+        )
+        return content, blocks[best]
+
+
+def _link_density(paragraph: Tag, text: str) -> float:
+    """Share of a paragraph's text that is link text"""
+    link_chars = sum(len(a.get_text().strip()) for a in paragraph.find_all("a"))
+    return min(1.0, link_chars / len(text))
+
+
+def _substantial_texts(paragraphs) -> List[str]:
+    """Stripped text of paragraphs longer than 50 characters"""
+    texts = (p.get_text().strip() for p in paragraphs)
+    return [text for text in texts if len(text) > 50]
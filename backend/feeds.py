@@ -0,0 +1,326 @@
+"""
+Feed Ingestion Module - RSS/Atom Feeds and News Sitemaps
+Polls feeds with per-feed cursors so only new article URLs are scraped
+"""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from lxml import etree
+
+# Safe XML parser: no entity expansion or network access
+_XML_PARSER = etree.XMLParser(
+    resolve_entities=False, no_network=True, recover=True, huge_tree=False
+)
+
+
+def _local(tag) -> str:
+    """Tag name without its namespace"""
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+def _child(element, name: str):
+    """First direct child with the given local name"""
+    for child in element:
+        if _local(child.tag) == name:
+            return child
+    return None
+
+
+def _text(element, name: str) -> str:
+    """Stripped text of the first direct child with the given local name"""
+    child = _child(element, name)
+    return (child.text or "").strip() if child is not None else ""
+
+
+def _parse_date(value: str) -> Optional[datetime]:
+    """Parse RFC 822 (RSS) or ISO 8601 (Atom, sitemaps) dates as UTC"""
+    if not value:
+        return None
+
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def parse_feed(body: bytes) -> Tuple[List[Dict], List[str]]:
+    """
+    Parse an RSS 2.0 / RSS 1.0 / Atom feed or an XML sitemap
+
+    Args:
+        body: Raw XML document
+
+    Returns:
+        Tuple of (items, child_sitemaps). Items are dicts with 'guid',
+        'url' and 'published' (datetime or None); child_sitemaps lists the
+        sitemap URLs of a sitemap index.
+    """
+    root = etree.fromstring(body, parser=_XML_PARSER)
+    if root is None:
+        raise ValueError("Empty or unparseable feed")
+
+    items = []
+    children = []
+    kind = _local(root.tag)
+
+    if kind == "sitemapindex":
+        for sitemap in root:
+            loc = _text(sitemap, "loc")
+            if loc:
+                children.append(loc)
+
+    elif kind == "urlset":
+        for entry in root:
+            loc = _text(entry, "loc")
+            if not loc:
+                continue
+            news = _child(entry, "news")
+            published = _text(news, "publication_date") if news is not None else ""
+            items.append(
+                {
+                    "guid": loc,
+                    "url": loc,
+                    "published": _parse_date(published or _text(entry, "lastmod")),
+                }
+            )
+
+    elif kind == "feed":
+        for entry in root:
+            if _local(entry.tag) != "entry":
+                continue
+            url = ""
+            for link in entry:
+                rel = link.get("rel", "alternate")
+                if _local(link.tag) == "link" and rel == "alternate":
+                    url = link.get("href", "").strip()
+                    break
+            guid = _text(entry, "id") or url
+            published = _text(entry, "published") or _text(entry, "updated")
+            if url:
+                items.append(
+                    {"guid": guid, "url": url, "published": _parse_date(published)}
+                )
+
+    else:
+        # RSS 2.0 nests items in <channel>; RSS 1.0 (RDF) puts them at the root
+        channel = _child(root, "channel")
+        containers = [root] if channel is None else [channel, root]
+        for container in containers:
+            for item in container:
+                if _local(item.tag) != "item":
+                    continue
+                url = _text(item, "link")
+                guid = _text(item, "guid") or url
+                published = _text(item, "pubDate") or _text(item, "date")
+                if url:
+                    items.append(
+                        {"guid": guid, "url": url, "published": _parse_date(published)}
+                    )
+
+    return items, children
+
+
+class FeedIngester:
+    """
+    Polls RSS/Atom feeds and news sitemaps for new article URLs
+
+    Each feed keeps a cursor (HTTP validators, newest publication date and
+    recently seen GUIDs) persisted to a JSON file, so a poll only costs a
+    conditional GET of the feed and returns articles not handed out before.
+    """
+
+    def __init__(
+        self,
+        scraper,
+        state_path: str = "data/feed_state.json",
+        max_remembered: int = 1000,
+        max_sitemap_depth: int = 1,
+    ):
+        """
+        Initialize feed ingester
+
+        Args:
+            scraper: WebScraper whose session and rate limiter are reused
+            state_path: JSON file holding per-feed cursors
+            max_remembered: GUIDs remembered per feed
+            max_sitemap_depth: How deep sitemap indexes are followed
+        """
+        self.scraper = scraper
+        self.state_path = Path(state_path)
+        self.max_remembered = max_remembered
+        self.max_sitemap_depth = max_sitemap_depth
+        self._lock = threading.Lock()
+        self._state = self._load_state()
+
+    def poll(self, feed_urls: List[str]) -> List[str]:
+        """
+        Poll feeds and return article URLs not seen before
+
+        Args:
+            feed_urls: RSS/Atom feed or sitemap URLs
+
+        Returns:
+            New article URLs, newest first within each feed, without duplicates
+        """
+        return [item["url"] for item in self._poll_items(feed_urls)]
+
+    def poll_into(self, frontier, feed_urls: List[str]) -> int:
+        """
+        Poll feeds and queue new articles in a crawl frontier
+
+        Publication dates are passed along so fresher articles are
+        scraped first.
+
+        Args:
+            frontier: CrawlFrontier to queue into
+            feed_urls: RSS/Atom feed or sitemap URLs
+
+        Returns:
+            Number of URLs queued (URLs the frontier has seen are skipped)
+        """
+        items = self._poll_items(feed_urls)
+        return frontier.add_many(
+            (item["url"], None, item["published"]) for item in items
+        )
+
+    def poll_and_scrape(self, feed_urls: List[str]) -> List[Dict[str, str]]:
+        """
+        Poll feeds and scrape only the new articles
+
+        Args:
+            feed_urls: RSS/Atom feed or sitemap URLs
+
+        Returns:
+            Scrape results for new articles (see WebScraper.scrape_multiple)
+        """
+        return self.scraper.scrape_multiple(self.poll(feed_urls))
+
+    def reset(self, feed_url: Optional[str] = None):
+        """
+        Forget cursors so the next poll returns every item again
+
+        Args:
+            feed_url: Feed to reset (default: all feeds)
+        """
+        with self._lock:
+            if feed_url is None:
+                self._state = {}
+            else:
+                self._state.pop(feed_url, None)
+        self._save_state()
+
+    def _poll_items(self, feed_urls: List[str]) -> List[Dict]:
+        """Poll feeds concurrently and return new items without duplicate URLs"""
+        if not feed_urls:
+            return []
+
+        workers = min(self.scraper.max_concurrency, len(feed_urls))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            batches = list(executor.map(self._poll_feed, feed_urls))
+
+        self._save_state()
+
+        new_items = []
+        seen = set()
+        for batch in batches:
+            for item in batch:
+                if item["url"] not in seen:
+                    seen.add(item["url"])
+                    new_items.append(item)
+        return new_items
+
+    def _poll_feed(self, feed_url: str, depth: int = 0) -> List[Dict]:
+        """Fetch one feed and return its new items"""
+        with self._lock:
+            cursor = dict(self._state.get(feed_url, {}))
+
+        headers = {}
+        if cursor.get("etag"):
+            headers["If-None-Match"] = cursor["etag"]
+        if cursor.get("last_modified"):
+            headers["If-Modified-Since"] = cursor["last_modified"]
+
+        try:
+            response = self.scraper.fetch_raw(feed_url, headers=headers)
+            if response["status"] == 304:
+                # Unchanged; a sitemap index's children may still have news
+                items, children = [], cursor.get("children", [])
+            else:
+                items, children = parse_feed(response["body"])
+        except Exception as e:
+            print(f"⚠️ Failed to poll {feed_url}: {e}")
+            return []
+
+        new_items = []
+        if depth < self.max_sitemap_depth:
+            for child in children:
+                new_items.extend(self._poll_feed(child, depth + 1))
+
+        seen = set(cursor.get("seen", []))
+        last_published = _parse_date(cursor.get("last_published", ""))
+        newest = last_published
+
+        fresh = []
+        for item in items:
+            if item["guid"] in seen:
+                continue
+            published = item["published"]
+            # Older than the cursor: already handed out, or fell out of `seen`
+            if published and last_published and published < last_published:
+                continue
+            fresh.append(item)
+            seen.add(item["guid"])
+            if published and (newest is None or published > newest):
+                newest = published
+
+        epoch = datetime.min.replace(tzinfo=timezone.utc)
+        fresh.sort(key=lambda item: item["published"] or epoch, reverse=True)
+        new_items.extend(fresh)
+
+        remembered = [item["guid"] for item in fresh] + cursor.get("seen", [])
+        cursor.update(
+            {
+                "etag": response["headers"].get("ETag", cursor.get("etag")),
+                "last_modified": response["headers"].get(
+                    "Last-Modified", cursor.get("last_modified")
+                ),
+                "last_published": newest.isoformat() if newest else "",
+                "seen": remembered[: self.max_remembered],
+                "children": children,
+            }
+        )
+        with self._lock:
+            self._state[feed_url] = cursor
+
+        return new_items
+
+    def _load_state(self) -> Dict:
+        """Read feed cursors from disk"""
+        if not self.state_path.exists():
+            return {}
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self):
+        """Write feed cursors to disk atomically"""
+        with self._lock:
+            data = json.dumps(self._state)
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        tmp_path.write_text(data, encoding="utf-8")
+        tmp_path.replace(self.state_path)
@@ -0,0 +1,354 @@
+"""
+Frontier Module - Persistent Crawl Frontier
+Queues URLs by source importance and freshness in SQLite and remembers
+every URL ever queued in an mmap-backed Bloom filter, so continuous
+ingestion survives restarts and never fetches a URL twice
+"""
+
+import hashlib
+import math
+import mmap
+import sqlite3
+import struct
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from backend.canonical import canonicalize_url
+
+# File header: magic, number of bits, number of hash functions
+_BLOOM_MAGIC = b"BLM1"
+_BLOOM_HEADER = struct.Struct("<4sQI")
+
+PENDING = 0
+IN_FLIGHT = 1
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter stored in a memory-mapped file
+
+    Membership tests may return false positives at roughly error_rate once
+    capacity items are added, but never false negatives. The bit array
+    lives in the page cache, so memory use stays flat however many URLs
+    are added.
+    """
+
+    def __init__(
+        self, path: str, capacity: int = 10_000_000, error_rate: float = 0.001
+    ):
+        """
+        Open (or create) a Bloom filter file
+
+        Args:
+            path: File holding the bit array
+            capacity: Expected number of items
+            error_rate: False positive rate at capacity
+
+        An existing file keeps the size it was created with.
+        """
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be in (0, 1)")
+
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        if not self.path.exists():
+            num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+            num_bits += -num_bits % 8
+            num_hashes = max(1, round(num_bits / max(1, capacity) * math.log(2)))
+            with open(self.path, "wb") as bloom_file:
+                bloom_file.write(_BLOOM_HEADER.pack(_BLOOM_MAGIC, num_bits, num_hashes))
+                bloom_file.truncate(_BLOOM_HEADER.size + num_bits // 8)
+
+        self._file = open(self.path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, self.num_bits, self.num_hashes = _BLOOM_HEADER.unpack_from(self._map)
+        if magic != _BLOOM_MAGIC:
+            raise ValueError(f"{self.path} is not a Bloom filter file")
+
+    def add(self, key: str) -> bool:
+        """
+        Add a key
+
+        Args:
+            key: Item to add
+
+        Returns:
+            True if the key was not (probably) present before
+        """
+        added = False
+        with self._lock:
+            for bit in self._bits(key):
+                offset = _BLOOM_HEADER.size + bit // 8
+                mask = 1 << (bit % 8)
+                byte = self._map[offset]
+                if not byte & mask:
+                    self._map[offset] = byte | mask
+                    added = True
+        return added
+
+    def __contains__(self, key: str) -> bool:
+        """Check whether a key was (probably) added"""
+        return all(
+            self._map[_BLOOM_HEADER.size + bit // 8] & (1 << (bit % 8))
+            for bit in self._bits(key)
+        )
+
+    def flush(self):
+        """Write dirty pages back to the file"""
+        with self._lock:
+            self._map.flush()
+
+    def close(self):
+        """Flush and unmap the file"""
+        with self._lock:
+            self._map.flush()
+            self._map.close()
+            self._file.close()
+
+    def _bits(self, key: str) -> List[int]:
+        """Bit positions for a key (Kirsch-Mitzenmacher double hashing)"""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first, second = struct.unpack("<QQ", digest)
+        second |= 1
+        return [(first + i * second) % self.num_bits for i in range(self.num_hashes)]
+
+
+class CrawlFrontier:
+    """
+    Persistent priority queue of URLs to scrape
+
+    Priority is importance x freshness, where freshness halves every
+    half_life_hours of age. Because every entry decays at the same rate,
+    the ordering never changes over time and can be stored as a single
+    log-scale score at insertion.
+
+    URLs handed out by pop() stay in the queue as in-flight until
+    mark_done(); after a crash they are handed out again. URLs that fail
+    are requeued by mark_failed() at half their priority, and dropped after
+    max_attempts tries.
+    """
+
+    def __init__(
+        self,
+        path: str = "data/frontier.sqlite3",
+        seen_path: Optional[str] = None,
+        capacity: int = 10_000_000,
+        error_rate: float = 0.001,
+        half_life_hours: float = 24.0,
+        source_importance: Optional[Dict[str, float]] = None,
+        max_attempts: int = 3,
+    ):
+        """
+        Open (or create) a frontier
+
+        Args:
+            path: SQLite database file for the queue
+            seen_path: Bloom filter file (default: next to the database)
+            capacity: Expected number of distinct URLs over the frontier's life
+            error_rate: Chance a never-seen URL is wrongly skipped at capacity
+            half_life_hours: Age at which a URL's freshness halves
+            source_importance: Importance per domain (default 1.0)
+            max_attempts: Scrape attempts before a failing URL is dropped
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.half_life_hours = half_life_hours
+        self.source_importance = source_importance or {}
+        self.max_attempts = max(1, max_attempts)
+        self.seen = BloomFilter(
+            seen_path or str(self.path.with_suffix(".bloom")), capacity, error_rate
+        )
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS queue (
+                url TEXT PRIMARY KEY,
+                score REAL NOT NULL,
+                state INTEGER NOT NULL DEFAULT 0,
+                attempts INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(queue)")}
+        if "attempts" not in columns:
+            self._conn.execute(
+                "ALTER TABLE queue ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0"
+            )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS queue_state_score ON queue (state, score)"
+        )
+        # Anything still in flight was interrupted by a restart
+        self._conn.execute("UPDATE queue SET state = ?", (PENDING,))
+        self._conn.commit()
+
+    def add(
+        self,
+        url: str,
+        importance: Optional[float] = None,
+        published: Optional[datetime] = None,
+    ) -> bool:
+        """
+        Queue a URL unless it was queued before
+
+        Args:
+            url: Article URL
+            importance: Source importance (default: from source_importance)
+            published: Publication time (default: now)
+
+        Returns:
+            True if the URL was queued
+        """
+        return self.add_many([(url, importance, published)]) == 1
+
+    def add_many(
+        self,
+        entries: Iterable[Tuple[str, Optional[float], Optional[datetime]]],
+    ) -> int:
+        """
+        Queue several URLs in one transaction
+
+        Args:
+            entries: (url, importance, published) tuples, see add()
+
+        Returns:
+            Number of URLs queued
+        """
+        rows = {}
+        for url, importance, published in entries:
+            key = canonicalize_url(url)
+            if key in rows or key in self.seen:
+                continue
+            rows[key] = self._score(key, importance, published)
+
+        if rows:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO queue (url, score) VALUES (?, ?)",
+                    rows.items(),
+                )
+                self._conn.commit()
+            # Mark seen only once the URLs are durably queued, so a failed
+            # insert never leaves a URL skipped but never crawled
+            for key in rows:
+                self.seen.add(key)
+            self.seen.flush()
+        return len(rows)
+
+    def pop(self, count: int = 1) -> List[str]:
+        """
+        Take the highest-priority URLs
+
+        Args:
+            count: Maximum number of URLs
+
+        Returns:
+            URLs, highest priority first, marked in-flight
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url FROM queue WHERE state = ? ORDER BY score DESC LIMIT ?",
+                (PENDING, count),
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE queue SET state = ? WHERE url = ?",
+                [(IN_FLIGHT, url) for (url,) in rows],
+            )
+            self._conn.commit()
+        return [url for (url,) in rows]
+
+    def mark_done(self, urls: Iterable[str]):
+        """
+        Remove processed URLs from the queue (they stay in the seen-set)
+
+        Args:
+            urls: URLs returned by pop()
+        """
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM queue WHERE url = ?",
+                [(canonicalize_url(url),) for url in urls],
+            )
+            self._conn.commit()
+
+    def mark_failed(self, urls: Iterable[str]):
+        """
+        Requeue URLs that could not be scraped at half their priority
+
+        URLs that have failed max_attempts times are removed from the queue
+        (they stay in the seen-set).
+
+        Args:
+            urls: URLs returned by pop()
+        """
+        keys = [(canonicalize_url(url),) for url in urls]
+        with self._lock:
+            self._conn.executemany(
+                """
+                UPDATE queue SET state = ?, score = score - 1, attempts = attempts + 1
+                WHERE url = ?
+                """,
+                [(PENDING, key) for (key,) in keys],
+            )
+            self._conn.executemany(
+                "DELETE FROM queue WHERE url = ? AND attempts >= ?",
+                [(key, self.max_attempts) for (key,) in keys],
+            )
+            self._conn.commit()
+
+    def scrape_next(self, scraper, count: int = 20) -> List[Dict[str, str]]:
+        """
+        Pop a batch of URLs, scrape them, mark successes done and requeue
+        failures
+
+        Args:
+            scraper: WebScraper to fetch with
+            count: Batch size
+
+        Returns:
+            Scrape results (see WebScraper.scrape_multiple)
+        """
+        urls = self.pop(count)
+        if not urls:
+            return []
+        results = scraper.scrape_multiple(urls)
+        self.mark_done(url for url, result in zip(urls, results) if result["success"])
+        self.mark_failed(
+            url for url, result in zip(urls, results) if not result["success"]
+        )
+        return results
+
+    def __len__(self) -> int:
+        """Number of queued (pending or in-flight) URLs"""
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM queue").fetchone()
+        return count
+
+    def __contains__(self, url: str) -> bool:
+        """Check whether a URL was (probably) ever queued"""
+        return canonicalize_url(url) in self.seen
+
+    def close(self):
+        """Close the database and the seen-set"""
+        with self._lock:
+            self._conn.close()
+        self.seen.close()
+
+    def _score(
+        self, url: str, importance: Optional[float], published: Optional[datetime]
+    ) -> float:
+        """log2(importance x freshness) shifted so it never needs updating"""
+        if importance is None:
+            domain = urlparse(url).netloc
+            importance = self.source_importance.get(domain, 1.0)
+        timestamp = published.timestamp() if published else time.time()
+        return math.log2(max(importance, 1e-9)) + timestamp / (
+            self.half_life_hours * 3600
+        )
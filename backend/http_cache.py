@@ -0,0 +1,218 @@
+"""
+HTTP Cache Module - Persistent Response Cache
+Stores page bodies, validators and extracted text so re-scrapes can use
+conditional GETs and skip parsing when the page has not changed
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from backend.canonical import canonicalize_url
+
+
+def cache_key(url: str) -> str:
+    """
+    Normalize a URL for cache lookups
+
+    Args:
+        url: Requested URL
+
+    Returns:
+        URL as normalized by canonicalize_url()
+    """
+    return canonicalize_url(url)
+
+
+class HTTPCache:
+    """
+    On-disk response cache backed by SQLite
+
+    Entries are evicted least-recently-used first once the stored bodies
+    and extracted text exceed max_bytes.
+    """
+
+    def __init__(
+        self, path: str = "data/http_cache.sqlite3", max_bytes: int = 200_000_000
+    ):
+        """
+        Initialize cache
+
+        Args:
+            path: SQLite database file (created if missing)
+            max_bytes: Size cap for cached bodies and extracted content
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB,
+                title TEXT,
+                content TEXT,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)"
+        )
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Look up a cached entry
+
+        Args:
+            url: Requested URL
+
+        Returns:
+            Dict with 'etag', 'last_modified', 'body', 'title', 'content',
+            or None if the URL is not cached
+        """
+        key = cache_key(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body, title, content FROM entries WHERE url = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._conn.execute(
+                "UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), key)
+            )
+            self._conn.commit()
+
+        etag, last_modified, body, title, content = row
+        return {
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body,
+            "title": title,
+            "content": content,
+        }
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        title: str,
+        content: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        """
+        Store a response and its extracted text
+
+        Responses without an ETag or Last-Modified header cannot be
+        revalidated and are not stored.
+
+        Args:
+            url: Requested URL
+            body: Raw response body
+            title: Extracted title
+            content: Extracted article text
+            etag: ETag response header
+            last_modified: Last-Modified response header
+        """
+        if not etag and not last_modified:
+            return
+
+        size = len(body) + len(content.encode("utf-8")) + len(title.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO entries
+                    (url, etag, last_modified, body, title, content, size, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    cache_key(url),
+                    etag,
+                    last_modified,
+                    body,
+                    title,
+                    content,
+                    size,
+                    time.time(),
+                ),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def record_hit(self):
+        """Count a response served from cache"""
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self):
+        """Count a response that had to be downloaded"""
+        with self._lock:
+            self.misses += 1
+
+    def stats(self) -> Dict:
+        """
+        Get cache statistics
+
+        Returns:
+            Dict with 'hits', 'misses', 'hit_rate', 'entries', 'bytes'
+        """
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": entries,
+                "bytes": total,
+            }
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self):
+        """Drop least recently used entries until under max_bytes (lock held)"""
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT url, size FROM entries ORDER BY last_access ASC"
+        ).fetchall()
+        stale = []
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((url,))
+            total -= size
+
+        self._conn.executemany("DELETE FROM entries WHERE url = ?", stale)
@@ -0,0 +1,213 @@
+"""
+Quality Module - Pre-Embedding Quality Gate
+Rejects extraction failures, cookie walls, paywall stubs and error pages
+before they reach the embedding model, recording why each page was dropped
+"""
+
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+# Common function words per language; their share of a text identifies its
+# language and separates prose from menus, link lists and error stubs
+STOPWORDS: Dict[str, Set[str]] = {
+    "en": set(
+        "the a an and or but of to in on at for with by from as is are was were be "
+        "been has have had it its this that these those he she they we you i not "
+        "his her their our will would can could said".split()
+    ),
+    "es": set(
+        "el la los las un una y o de del en con por para que es son fue se su sus "
+        "al lo como más pero sin sobre este esta".split()
+    ),
+    "fr": set(
+        "le la les un une et ou de des du en dans au aux avec pour par que qui est "
+        "sont été se sa son ses ce cette pas sur".split()
+    ),
+    "de": set(
+        "der die das ein eine und oder von zu im in mit für auf ist sind war wurde "
+        "sich sein ihre nicht den dem des auch".split()
+    ),
+    "pt": set(
+        "o a os as um uma e ou de do da dos das em no na com por para que é são foi "
+        "se seu sua não mais".split()
+    ),
+    "it": set(
+        "il lo la i gli le un una e o di del della in con per che è sono fu si suo "
+        "sua non più come".split()
+    ),
+}
+
+# Phrases that mark a page as something other than an article when they
+# make up a noticeable part of a short text
+BOILERPLATE_PHRASES = (
+    "could not extract content from this page",
+    "we use cookies",
+    "accept all cookies",
+    "manage cookie settings",
+    "subscribe to continue reading",
+    "this article is for subscribers",
+    "already a subscriber",
+    "create a free account to continue",
+    "page not found",
+    "this page doesn't exist",
+    "this page does not exist",
+    "please enable javascript",
+    "access denied",
+    "verify you are human",
+    "are you a robot",
+)
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# Words written in Latin script, the only script STOPWORDS covers
+_LATIN_WORD = re.compile(r"^[a-z\u00c0-\u024f]+$")
+
+# Han, Hiragana and Katakana: written without spaces, so \w+ finds long
+# runs instead of words
+_CJK_CHAR = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]")
+
+
+def detect_language(words: List[str]) -> Tuple[Optional[str], float]:
+    """
+    Guess a text's language from its stopwords
+
+    Args:
+        words: Lowercased words of the text
+
+    Returns:
+        Tuple of (language code or None, share of words that are its stopwords)
+    """
+    if not words:
+        return None, 0.0
+
+    best, best_ratio = None, 0.0
+    for language, stopwords in STOPWORDS.items():
+        ratio = sum(1 for word in words if word in stopwords) / len(words)
+        if ratio > best_ratio:
+            best, best_ratio = language, ratio
+    return best, best_ratio
+
+
+class QualityGate:
+    """
+    Cheap checks that decide whether a scraped page is worth embedding
+
+    Checks run cheapest first: boilerplate phrases dominating a short page,
+    length, stopword ratio, then language. The first failing check is the page's
+    rejection reason. Stopword checks only apply to Latin-script text;
+    other scripts are judged by length alone, counted in characters for
+    Chinese and Japanese.
+    """
+
+    def __init__(
+        self,
+        min_chars: int = 200,
+        min_words: int = 40,
+        min_stopword_ratio: float = 0.15,
+        languages: Optional[List[str]] = None,
+        boilerplate_max_words: int = 80,
+        boilerplate_min_share: float = 0.1,
+    ):
+        """
+        Initialize quality gate
+
+        Args:
+            min_chars: Shortest accepted content
+            min_words: Fewest accepted words
+            min_stopword_ratio: Lowest accepted share of stopwords; prose is
+                usually 0.3-0.5, menus and link lists far less
+            languages: Accepted language codes from STOPWORDS (default: any
+                language, including scripts STOPWORDS doesn't cover)
+            boilerplate_max_words: Only pages up to this long are checked
+                for boilerplate phrases; longer pages are assumed to be
+                articles that merely mention one
+            boilerplate_min_share: Share of a short page's words that must
+                be boilerplate phrases for it to be rejected, so a news
+                brief quoting "page not found" still passes
+        """
+        self.min_chars = min_chars
+        self.min_words = min_words
+        self.min_stopword_ratio = min_stopword_ratio
+        self.languages = set(languages) if languages else None
+        self.boilerplate_max_words = boilerplate_max_words
+        self.boilerplate_min_share = boilerplate_min_share
+        self.rejected: List[Dict[str, str]] = []
+
+    def check(self, data: Dict) -> Optional[str]:
+        """
+        Check one scraped page
+
+        Args:
+            data: Scrape result with 'content'
+
+        Returns:
+            Rejection reason, or None if the page passes
+        """
+        content = data.get("content") or ""
+        lowered = content.lower()
+        words = _WORD.findall(lowered)
+
+        if words and len(words) <= self.boilerplate_max_words:
+            found = [phrase for phrase in BOILERPLATE_PHRASES if phrase in lowered]
+            phrase_words = sum(
+                lowered.count(phrase) * len(phrase.split()) for phrase in found
+            )
+            if found and phrase_words >= self.boilerplate_min_share * len(words):
+                return f"boilerplate: '{found[0]}'"
+
+        if len(content.strip()) < self.min_chars:
+            return f"too short: {len(content.strip())} chars"
+
+        # Chinese and Japanese have no spaces to count words by; min_chars
+        # is their length check
+        visible_chars = len("".join(content.split()))
+        is_cjk = len(_CJK_CHAR.findall(content)) * 2 >= visible_chars
+        if not is_cjk and len(words) < self.min_words:
+            return f"too short: {len(words)} words"
+
+        latin_words = sum(1 for word in words if _LATIN_WORD.match(word))
+        if latin_words * 2 < len(words):
+            # No stopword list for this script
+            if self.languages is not None:
+                return "language: unsupported script"
+            return None
+
+        language, ratio = detect_language(words)
+        if ratio < self.min_stopword_ratio:
+            return f"low stopword ratio: {ratio:.2f}"
+        if self.languages is not None and language not in self.languages:
+            return f"language: {language}"
+
+        return None
+
+    def filter(self, scraped_data: List[Dict]) -> List[Dict]:
+        """
+        Drop pages that fail the gate
+
+        Rejections are appended to self.rejected as dicts with 'url',
+        'title' and 'reason'.
+
+        Args:
+            scraped_data: Successful scrape results
+
+        Returns:
+            Pages that passed, in input order
+        """
+        accepted = []
+        for data in scraped_data:
+            reason = self.check(data)
+            if reason is None:
+                accepted.append(data)
+            else:
+                self.rejected.append(
+                    {
+                        "url": data.get("url", ""),
+                        "title": data.get("title", ""),
+                        "reason": reason,
+                    }
+                )
+        return accepted
+
+    def reset(self):
+        """Forget recorded rejections"""
+        self.rejected = []
@@ -7,8 +7,146 @@ from langchain_ollama import OllamaEmbeddings
 from langchain_community.vectorstores import FAISS
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
-from typing import List, Dict
+from typing import List, Dict, Optional
+from pathlib import Path
+import faiss
+import hashlib
+import json
 import os
+import shutil
+import threading
+import time
+from backend.chunk_store import ChunkList, ChunkStore
+from backend.dedup import ArticleDeduplicator, normalize_content
+from backend.quality import QualityGate
+from backend.embedding_cache import CachedEmbeddings, EmbeddingCache
+from backend.embedding_executor import EmbeddingExecutor
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are only serialized within the process
+    fcntl = None
+
+# Serializes saves between pipelines of this process (fcntl covers others)
+_SAVE_LOCK = threading.Lock()
+
+
+def paragraph_chunks(
+    text: str,
+    chunk_size: int = 1000,
+    min_chunk_size: int = 300,
+    boundary_bits: int = 2,
+    splitter: Optional[RecursiveCharacterTextSplitter] = None,
+) -> List[str]:
+    """
+    Split article text into chunks of whole paragraphs
+
+    Chunk boundaries are content-defined: a chunk ends after a paragraph
+    whose hash has its low boundary_bits bits zero (once the chunk holds
+    min_chunk_size characters), or before a paragraph that would overflow
+    chunk_size. An edit therefore only changes the chunks around it, and an
+    appended paragraph only changes the last chunk.
+
+    Args:
+        text: Article content, paragraphs separated by blank lines
+        chunk_size: Maximum characters per chunk
+        min_chunk_size: Characters a chunk needs before a hash boundary counts
+        boundary_bits: Hash bits that must be zero for a boundary
+            (on average a boundary every 2**boundary_bits paragraphs)
+        splitter: Splitter for paragraphs longer than chunk_size
+
+    Returns:
+        Chunk texts in document order
+    """
+    mask = (1 << boundary_bits) - 1
+    chunks = []
+    current = []
+    length = 0
+
+    def flush():
+        nonlocal current, length
+        if current:
+            chunks.append("\n\n".join(current))
+        current, length = [], 0
+
+    for paragraph in text.split("\n\n"):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+
+        if len(paragraph) > chunk_size:
+            flush()
+            if splitter is not None:
+                chunks.extend(splitter.split_text(paragraph))
+            else:
+                chunks.append(paragraph)
+            continue
+
+        if current and length + len(paragraph) + 2 > chunk_size:
+            flush()
+
+        current.append(paragraph)
+        length += len(paragraph) + 2
+
+        digest = hashlib.blake2b(
+            normalize_content(paragraph).encode("utf-8"), digest_size=8
+        ).digest()
+        if length >= min_chunk_size and not int.from_bytes(digest, "big") & mask:
+            flush()
+
+    flush()
+    return chunks
+
+
+def chunk_id(url: str, text: str) -> str:
+    """
+    Stable vector store id for a chunk
+
+    Args:
+        url: Article URL
+        text: Chunk text
+
+    Returns:
+        Hex SHA-256 of the URL and chunk text
+    """
+    return hashlib.sha256(f"{url}\n{text}".encode("utf-8")).hexdigest()
+
+
+def read_index(path: str):
+    """
+    Open a saved FAISS index, memory-mapping its vectors where supported
+
+    A mapped index opens without reading the vectors, and processes that
+    map the same file share its pages. Mapped indexes are read-only.
+
+    Returns:
+        Tuple of (index, whether it is memory-mapped)
+    """
+    flag = getattr(faiss, "IO_FLAG_MMAP_IFC", None)  # faiss >= 1.9
+    if flag is not None:
+        try:
+            return faiss.read_index(path, flag), True
+        except RuntimeError:
+            pass  # index type that can't be mapped
+    return faiss.read_index(path), False
+
+
+def has_saved_index(path: str) -> bool:
+    """True if path holds a completed RAGPipeline.save()"""
+    return (Path(path) / "CURRENT").exists()
+
+
+def saved_generation(path: str) -> Optional[str]:
+    """Generation published by the latest RAGPipeline.save() to path, or None"""
+    try:
+        return (Path(path) / "CURRENT").read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+
+
+class StaleSaveError(RuntimeError):
+    """Raised when another pipeline saved to the same directory since this
+    one was loaded or last saved there"""
 
 
 class RAGPipeline:
@@ -17,18 +155,51 @@ class RAGPipeline:
     Manages document ingestion, embedding, and retrieval
     """
 
-    def __init__(self, model: str = "nomic-embed-text"):
+    def __init__(
+        self,
+        model: str = "nomic-embed-text",
+        embedding_cache: Optional[EmbeddingCache] = None,
+        embed_batch_size: int = 32,
+        embed_concurrency: int = 4,
+    ):
         """
         Initialize RAG pipeline with Ollama embeddings
 
         Args:
             model: Ollama embedding model name (default: nomic-embed-text)
+            embedding_cache: Optional EmbeddingCache consulted before the
+                model, so previously embedded chunks cost no model calls
+            embed_batch_size: Chunks per embedding request
+            embed_concurrency: Embedding requests in flight at once
         """
-        self.embeddings = OllamaEmbeddings(model=model)
+        # Cache misses go through the executor in concurrent batches; set
+        # self.executor.progress_callback to follow long ingests
+        self.executor = EmbeddingExecutor(
+            OllamaEmbeddings(model=model),
+            batch_size=embed_batch_size,
+            concurrency=embed_concurrency,
+        )
+        self.embeddings = self.executor
+        if embedding_cache is not None:
+            self.embeddings = CachedEmbeddings(self.embeddings, embedding_cache, model)
         self.vector_store = None
-        self.documents = []
+        self.deduplicator = ArticleDeduplicator()
+        # Dedup state file of a loaded save, restored on first use
+        self._dedup_state_file = None
+        self.quality_gate = QualityGate()
 
-        # Text splitter for chunking
+        # Per-URL chunk ids (fingerprints of paragraph groups) and metadata,
+        # so a re-scrape only embeds chunks whose paragraphs changed
+        self._url_chunks_file = None
+        self.url_chunks: Dict[str, List[str]] = {}
+        self.article_metadata: Dict[str, Dict] = {}
+        self._chunks = ChunkStore()
+        # Set while the index is a read-only mapping of a saved file
+        self._mapped = False
+        # Save generation this pipeline was loaded from or last saved as
+        self.generation: Optional[str] = None
+
+        # Text splitter for paragraphs too long to be a chunk on their own
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=1000,
             chunk_overlap=200,
@@ -36,40 +207,377 @@ class RAGPipeline:
             separators=["\n\n", "\n", ". ", " ", ""],
         )
 
+    @property
+    def url_chunks(self) -> Dict[str, List[str]]:
+        """Chunk ids per article URL (a loaded save's are read on first use)"""
+        if self._url_chunks_file is not None:
+            with self._url_chunks_file as f:
+                self._url_chunks = json.load(f)
+            self._url_chunks_file = None
+        return self._url_chunks
+
+    @url_chunks.setter
+    def url_chunks(self, url_chunks: Dict[str, List[str]]):
+        self._url_chunks = url_chunks
+        self._url_chunks_file = None
+
+    @property
+    def documents(self) -> ChunkList:
+        """All chunks in article order (read from the store on access)"""
+        return ChunkList(self.url_chunks, self._chunks)
+
     def ingest_documents(self, scraped_data: List[Dict[str, str]]):
         """
         Process scraped content and create vector store
 
+        Replaces anything ingested before; use add_documents() to grow
+        the existing index instead.
+
         Args:
             scraped_data: List of dicts from scraper with 'content', 'url', 'title', 'source_name'
         """
-        # Convert scraped data to LangChain Documents
-        documents = []
-        for data in scraped_data:
-            if data["success"] and data["content"]:
-                # Create document with metadata
-                doc = Document(
-                    page_content=data["content"],
-                    metadata={
-                        "source": data["source_name"],
-                        "url": data["url"],
-                        "title": data["title"],
-                    },
-                )
-                documents.append(doc)
+        valid = self._accepted(scraped_data)
 
-        if not documents:
+        # Collapse duplicate articles so each text is embedded once
+        self.deduplicator.reset()
+        self._dedup_state_file = None
+        unique = self.deduplicator.deduplicate(valid)
+
+        if not unique:
             raise ValueError("No valid documents to process")
 
-        # Split documents into chunks
-        self.documents = self.text_splitter.split_documents(documents)
+        self.vector_store = None
+        self.url_chunks = {}
+        self.article_metadata = {}
+        self._chunks = ChunkStore()
+        self._mapped = False
+        self._append(unique)
+
+        print(
+            f"✅ Ingested {len(unique)} documents, split into {len(self.documents)} chunks"
+            f" ({self.deduplicator.duplicates_skipped} duplicates and"
+            f" {self.deduplicator.near_duplicates_skipped} near-duplicates skipped,"
+            f" {len(self.quality_gate.rejected)} pages rejected)"
+        )
+
+    def add_documents(self, scraped_data: List[Dict[str, str]]) -> int:
+        """
+        Append new articles to the existing index
+
+        Only the new articles are chunked and embedded; they are checked
+        for duplicates against everything ingested so far. URLs already in
+        the index are skipped (see refresh_documents() to update them).
+
+        Args:
+            scraped_data: List of dicts from scraper with 'content', 'url', 'title', 'source_name'
+
+        Returns:
+            Number of articles added
+        """
+        valid = self._accepted(scraped_data)
+        self._restore_dedup()
+        new = [data for data in valid if data["url"] not in self.url_chunks]
+        unique = self.deduplicator.deduplicate(new)
+        added = self._append(unique)
+
+        print(
+            f"➕ Added {len(unique)} documents, {len(added)} chunks"
+            f" ({len(valid) - len(new)} already ingested,"
+            f" {len(new) - len(unique)} duplicates skipped,"
+            f" {len(self.quality_gate.rejected)} pages rejected)"
+        )
+        return len(unique)
+
+    def refresh_documents(self, scraped_data: List[Dict[str, str]]) -> Dict[str, int]:
+        """
+        Re-ingest re-scraped articles, embedding only what changed
+
+        Articles already in the index are re-chunked; chunks whose
+        paragraphs are unchanged keep their vectors, stale chunks are
+        deleted and only new or edited chunks are embedded. Articles not
+        seen before are deduplicated and added.
+
+        Args:
+            scraped_data: List of dicts from scraper with 'content', 'url', 'title', 'source_name'
+
+        Returns:
+            Dict with 'added', 'removed' and 'unchanged' chunk counts
+        """
+        valid = self._accepted(scraped_data)
+        self._restore_dedup()
+        known = [data for data in valid if data["url"] in self.url_chunks]
+        new = self.deduplicator.deduplicate(
+            [data for data in valid if data["url"] not in self.url_chunks]
+        )
+
+        added = []
+        removed = []
+        unchanged = 0
+        for data in known:
+            url = data["url"]
+            old_ids = self.url_chunks[url]
+            metadata = dict(self.article_metadata[url], title=data["title"])
+            added += self._index_article(url, data["content"], metadata)
+
+            kept = set(self.url_chunks[url])
+            removed += [cid for cid in old_ids if cid not in kept]
+            unchanged += sum(1 for cid in old_ids if cid in kept)
 
-        # Create vector store
-        self.vector_store = FAISS.from_documents(self.documents, self.embeddings)
+        if removed:
+            self._ensure_writable()
+            self.vector_store.delete(removed)  # also drops them from _chunks
+        self._add_chunks(added)
+        added += self._append(new)
 
         print(
-            f"✅ Ingested {len(documents)} documents, split into {len(self.documents)} chunks"
+            f"🔄 Refreshed {len(known)} documents and added {len(new)}:"
+            f" {len(added)} chunks embedded, {len(removed)} removed,"
+            f" {unchanged} unchanged, {len(self.quality_gate.rejected)} pages rejected"
         )
+        return {"added": len(added), "removed": len(removed), "unchanged": unchanged}
+
+    def _accepted(self, scraped_data: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Successful scrapes that pass the quality gate"""
+        valid = [data for data in scraped_data if data["success"] and data["content"]]
+
+        # Keep failed extractions and junk pages away from the embedder
+        self.quality_gate.reset()
+        return self.quality_gate.filter(valid)
+
+    def _append(self, articles: List[Dict]) -> List[Document]:
+        """Chunk and embed deduplicated articles not yet in the index"""
+        added = []
+        for data in articles:
+            added += self._index_article(
+                data["url"], data["content"], self._metadata(data)
+            )
+        self._add_chunks(added)
+        return added
+
+    def _metadata(self, data: Dict) -> Dict:
+        """Chunk metadata shared by every chunk of a deduplicated article"""
+        metadata = {
+            "source": data["source_name"],
+            "url": data["url"],
+            "title": data["title"],
+            "sources": data["source_names"],
+            "urls": data["urls"],
+        }
+        if "near_duplicate_of" in data:
+            metadata["near_duplicate_of"] = data["near_duplicate_of"]
+        return metadata
+
+    def _index_article(self, url: str, content: str, metadata: Dict) -> List[Document]:
+        """
+        Chunk an article and record its chunk ids
+
+        Returns:
+            Chunks not already in the vector store
+        """
+        ids = []
+        new_chunks = []
+        for text in paragraph_chunks(content, splitter=self.text_splitter):
+            cid = chunk_id(url, text)
+            if cid in ids:
+                continue
+            ids.append(cid)
+            # Unchanged chunks keep their vectors (and stored metadata)
+            if cid not in self._chunks:
+                doc = Document(page_content=text, metadata=dict(metadata, chunk_id=cid))
+                self._chunks[cid] = doc
+                new_chunks.append(doc)
+
+        self.url_chunks[url] = ids
+        self.article_metadata[url] = metadata
+        return new_chunks
+
+    def _add_chunks(self, chunks: List[Document]):
+        """Embed new chunks into the vector store"""
+        if not chunks:
+            return
+
+        ids = [doc.metadata["chunk_id"] for doc in chunks]
+        if self.vector_store is None:
+            # The vector store shares _chunks as its docstore
+            self.vector_store = FAISS.from_documents(
+                chunks, self.embeddings, ids=ids, docstore=self._chunks
+            )
+        else:
+            self._ensure_writable()
+            self.vector_store.add_documents(chunks, ids=ids)
+
+    def _restore_dedup(self):
+        """Restore a loaded save's dedup state before articles are added"""
+        if self._dedup_state_file is None:
+            return
+
+        with self._dedup_state_file as f:
+            dedup = json.load(f)
+        self._dedup_state_file = None
+
+        # Share URL and source lists between an article, its chunks and its
+        # dedup entry again, so merges of later duplicates reach all three
+        for article in dedup["articles"].values():
+            metadata = self.article_metadata.get(article["url"])
+            if metadata is not None:
+                article["urls"] = metadata["urls"]
+                article["source_names"] = metadata["sources"]
+        self.deduplicator.restore(dedup)
+
+    def save(self, path: str, force: bool = False):
+        """
+        Persist the index, chunks and ingest state to a directory
+
+        Writes index.faiss (the raw FAISS index), chunks.sqlite3 (chunk
+        text and metadata, one row per index row), state.json (article
+        metadata), url_chunks.json (per-URL chunk ids) and dedup.json into
+        a new generation subdirectory, then points the CURRENT file at it. A
+        crash mid-save leaves the previous save in use, and pipelines that
+        opened an older generation keep reading intact files.
+
+        Every save writes the whole index again. Saves are serialized, and
+        a pipeline may only replace the generation it was loaded from or
+        last saved: when another pipeline published in between, this one
+        would silently drop that pipeline's articles, so StaleSaveError is
+        raised instead (load the newer save and re-apply the changes).
+
+        Args:
+            path: Directory to write (created if missing)
+            force: Replace whatever was saved last, even by another pipeline
+
+        Raises:
+            StaleSaveError: If another pipeline saved to path in between
+        """
+        if self.vector_store is None:
+            raise ValueError(
+                "No documents ingested yet. Call ingest_documents() first."
+            )
+
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+        with _SAVE_LOCK, open(directory / "LOCK", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)  # released on close
+
+            current = saved_generation(path)
+            if not force and current is not None and current != self.generation:
+                raise StaleSaveError(
+                    f"{directory} was saved by another pipeline (generation"
+                    f" {current}, expected {self.generation})"
+                )
+            self._restore_dedup()
+            self._write_generation(directory)
+
+        print(f"💾 Saved {self.vector_store.index.ntotal} chunks to {directory}")
+
+    def _write_generation(self, directory: Path):
+        """Write a new generation subdirectory and publish it (lock held)"""
+        generation = str(time.time_ns())
+        target = directory / generation
+        target.mkdir()
+        store = self.vector_store
+
+        faiss.write_index(store.index, str(target / "index.faiss"))
+
+        row_ids = store.index_to_docstore_id
+        if not isinstance(row_ids, dict):
+            row_ids = row_ids.to_dict()
+        ChunkStore.write(
+            target / "chunks.sqlite3",
+            (store.docstore.search(row_ids[row]) for row in range(store.index.ntotal)),
+        )
+
+        state = {
+            "chunks": store.index.ntotal,
+            "article_metadata": self.article_metadata,
+        }
+        (target / "state.json").write_text(json.dumps(state), encoding="utf-8")
+        (target / "url_chunks.json").write_text(
+            json.dumps(self.url_chunks), encoding="utf-8"
+        )
+        (target / "dedup.json").write_text(
+            json.dumps(self.deduplicator.state()), encoding="utf-8"
+        )
+
+        # Switching CURRENT is the atomic step that publishes the save
+        tmp_path = directory / "CURRENT.tmp"
+        tmp_path.write_text(generation, encoding="utf-8")
+        tmp_path.replace(directory / "CURRENT")
+        self.generation = generation
+
+        # Unlinked files stay readable to processes that still have them open
+        for old in directory.iterdir():
+            if old.is_dir() and old.name != generation:
+                shutil.rmtree(old, ignore_errors=True)
+
+    def load(self, path: str):
+        """
+        Replace the pipeline's contents with a directory written by save()
+
+        Nothing proportional to the number of chunks is read: the vectors
+        are memory-mapped when the installed faiss supports it (and copied
+        into memory the first time they are modified), chunk texts are read
+        from chunks.sqlite3 when retrieved, and per-URL chunk ids and the
+        dedup state are read when first needed.
+
+        Args:
+            path: Directory written by save()
+        """
+        # Every file is opened now: a later save by another pipeline deletes
+        # this generation, but open files stay readable
+        for attempt in range(3):
+            generation = saved_generation(path)
+            if generation is None:
+                raise FileNotFoundError(f"No saved index in {path}")
+            directory = Path(path) / generation
+            try:
+                state = json.loads(
+                    (directory / "state.json").read_text(encoding="utf-8")
+                )
+                index, mapped = read_index(str(directory / "index.faiss"))
+                chunks = ChunkStore(
+                    str(directory / "chunks.sqlite3"), state["article_metadata"]
+                )
+                url_chunks_file = open(directory / "url_chunks.json", encoding="utf-8")
+                dedup_state_file = open(directory / "dedup.json", encoding="utf-8")
+                break
+            except (FileNotFoundError, RuntimeError):
+                # Replaced by a newer save while opening: open that one
+                if attempt == 2 or saved_generation(path) == generation:
+                    raise
+
+        saved = chunks.saved_count()
+        if not index.ntotal == saved == state["chunks"]:
+            raise ValueError(
+                f"{directory} is incomplete: {index.ntotal} vectors,"
+                f" {saved} chunks, {state['chunks']} expected"
+            )
+
+        self.url_chunks = {}
+        self._url_chunks_file = url_chunks_file
+        self.article_metadata = state["article_metadata"]
+        self.deduplicator.reset()
+        self._dedup_state_file = dedup_state_file
+
+        self._chunks = chunks
+        self.vector_store = FAISS(self.embeddings, index, chunks, chunks.row_ids())
+        self._mapped = mapped
+        self.generation = generation
+
+        print(
+            f"📂 Loaded {len(self.article_metadata)} documents,"
+            f" {saved} chunks from {directory}"
+            f"{' (memory-mapped)' if mapped else ''}"
+        )
+
+    def _ensure_writable(self):
+        """Copy a loaded save's index and row ids into memory before a change"""
+        store = self.vector_store
+        if self._mapped:
+            store.index = faiss.deserialize_index(faiss.serialize_index(store.index))
+            self._mapped = False
+        if not isinstance(store.index_to_docstore_id, dict):
+            store.index_to_docstore_id = store.index_to_docstore_id.to_dict()
 
     def retrieve_relevant_chunks(self, query: str, k: int = 5) -> List[Document]:
         """
@@ -132,17 +640,18 @@ class RAGPipeline:
         Returns:
             List of source metadata dicts
         """
-        if not self.documents:
+        if not self.article_metadata:
             return []
 
+        # One metadata dict per article rather than per chunk
         sources = {}
-        for doc in self.documents:
-            source_name = doc.metadata.get("source", "Unknown")
+        for metadata in self.article_metadata.values():
+            source_name = metadata.get("source", "Unknown")
             if source_name not in sources:
                 sources[source_name] = {
                     "source": source_name,
-                    "title": doc.metadata.get("title", "Unknown"),
-                    "url": doc.metadata.get("url", ""),
+                    "title": metadata.get("title", "Unknown"),
+                    "url": metadata.get("url", ""),
                 }
 
         return list(sources.values())
@@ -156,7 +665,14 @@ if __name__ == "__main__":
     # Sample data
     sample_data = [
         {
-            "content": "This is a test article about AI.",
+            "content": (
+                "Artificial intelligence is changing how newsrooms work. Editors"
+                " use it to sort wire copy, tag stories and suggest headlines,"
+                " while reporters rely on it to search archives and transcribe"
+                " interviews. Critics warn that the tools can repeat errors and"
+                " that readers should be told when a story was produced with"
+                " their help."
+            ),
             "url": "https://example.com",
             "title": "AI Article",
             "source_name": "example.com",
@@ -0,0 +1,100 @@
+"""
+Rate Limiter Module - Per-Domain Request Throttling
+Token buckets keyed by host so each publisher sees a polite request rate
+"""
+
+import threading
+import time
+from typing import Dict
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+
+    Tokens refill continuously at `rate` per second up to `burst`. A caller
+    that finds the bucket empty reserves the next token and is told how long
+    to wait for it, so concurrent callers queue up fairly.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initialize token bucket
+
+        Args:
+            rate: Tokens added per second
+            burst: Maximum number of tokens the bucket can hold
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take one token
+
+        Returns:
+            Seconds the caller must wait before using the token
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+            # May go negative: later callers then wait for their own token
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """Block until a token is available"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+class DomainRateLimiter:
+    """
+    Per-domain rate limiter
+
+    Requests to different domains never wait on each other; requests to the
+    same domain share one token bucket.
+    """
+
+    def __init__(self, requests_per_second: float = 1.0, burst: int = 1):
+        """
+        Initialize rate limiter
+
+        Args:
+            requests_per_second: Sustained request rate allowed per domain
+            burst: Number of requests a domain may receive back-to-back
+        """
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, domain: str) -> TokenBucket:
+        """Get or create the bucket for a domain"""
+        with self._lock:
+            bucket = self._buckets.get(domain)
+            if bucket is None:
+                bucket = TokenBucket(self.requests_per_second, self.burst)
+                self._buckets[domain] = bucket
+            return bucket
+
+    def acquire(self, domain: str):
+        """
+        Block until a request to the domain is allowed
+
+        Args:
+            domain: Host the request goes to, e.g. urlparse(url).netloc
+        """
+        self._bucket(domain).acquire()
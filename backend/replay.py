@@ -0,0 +1,412 @@
+"""
+Replay Module - Offline Record/Replay Transport for WebScraper
+Serves HTTP responses from a WARC file or a snapshot directory, and
+captures live fetches into either format, so scraping can be benchmarked
+and regression-tested without the network
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import threading
+import uuid
+import zlib
+from datetime import datetime, timezone
+from http.client import responses as HTTP_REASONS
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.models import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+try:
+    import brotli
+except ImportError:  # optional: only needed for 'br' bodies in WARC files
+    brotli = None
+
+# Headers that describe the wire encoding, not the stored (decoded) body
+_HOP_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+# (status, headers, body)
+Snapshot = Tuple[int, Dict[str, str], bytes]
+
+
+class SnapshotDirectory:
+    """
+    Directory of saved responses
+
+    Layout: bodies/<sha1 of url>.html plus index.jsonl, one JSON line per
+    response with 'url', 'status', 'headers' and 'file'. Later lines for the
+    same URL win, so recording only ever appends.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) a snapshot directory
+
+        Args:
+            path: Directory path
+        """
+        self.path = Path(path)
+        self._index: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+        index_path = self.path / "index.jsonl"
+        if index_path.exists():
+            with open(index_path, encoding="utf-8") as index_file:
+                for line in index_file:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._index[entry["url"]] = entry
+
+    def urls(self) -> List[str]:
+        """URLs available for replay"""
+        return list(self._index)
+
+    def get(self, url: str) -> Optional[Snapshot]:
+        """Saved response for a URL, or None"""
+        entry = self._index.get(url)
+        if entry is None:
+            return None
+        body = (self.path / entry["file"]).read_bytes()
+        return entry["status"], entry["headers"], body
+
+    def put(self, url: str, status: int, headers: Dict[str, str], body: bytes):
+        """Save a response"""
+        name = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        entry = {
+            "url": url,
+            "status": status,
+            "headers": headers,
+            "file": f"bodies/{name}.html",
+        }
+
+        with self._lock:
+            (self.path / "bodies").mkdir(parents=True, exist_ok=True)
+            (self.path / entry["file"]).write_bytes(body)
+            with open(self.path / "index.jsonl", "a", encoding="utf-8") as index:
+                index.write(json.dumps(entry) + "\n")
+            self._index[url] = entry
+
+
+class WarcArchive:
+    """
+    WARC/1.0 file of 'response' records (.warc, or .warc.gz with one gzip
+    member per record as written by standard crawlers)
+
+    Opening a file only scans record headers and remembers offsets; bodies
+    are read on demand.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) a WARC file
+
+        Args:
+            path: File path ending in .warc or .warc.gz
+        """
+        self.path = Path(path)
+        self.compressed = self.path.suffix == ".gz"
+        self._offsets: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        if self.path.exists():
+            for offset, record in self._scan():
+                url = _warc_target(record)
+                if url:
+                    self._offsets[url] = offset
+
+    def urls(self) -> List[str]:
+        """URLs available for replay"""
+        return list(self._offsets)
+
+    def get(self, url: str) -> Optional[Snapshot]:
+        """Saved response for a URL, or None"""
+        offset = self._offsets.get(url)
+        if offset is None:
+            return None
+
+        with open(self.path, "rb") as warc:
+            warc.seek(offset)
+            if self.compressed:
+                record = _read_gzip_member(warc)
+            else:
+                record = _read_warc_record(warc)
+        return _parse_http_response(record.split(b"\r\n\r\n", 1)[1])
+
+    def put(self, url: str, status: int, headers: Dict[str, str], body: bytes):
+        """Append a response record"""
+        reason = HTTP_REASONS.get(status, "")
+        head = [f"HTTP/1.1 {status} {reason}"]
+        head += [f"{name}: {value}" for name, value in headers.items()]
+        block = ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+        warc_headers = [
+            "WARC/1.0",
+            "WARC-Type: response",
+            f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>",
+            f"WARC-Date: {datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}",
+            f"WARC-Target-URI: {url}",
+            "Content-Type: application/http; msgtype=response",
+            f"Content-Length: {len(block)}",
+        ]
+        record = (
+            ("\r\n".join(warc_headers) + "\r\n\r\n").encode("utf-8")
+            + block
+            + b"\r\n\r\n"
+        )
+        if self.compressed:
+            record = gzip.compress(record)
+
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "ab") as warc:
+                offset = warc.tell()
+                warc.write(record)
+            self._offsets[url] = offset
+
+    def _scan(self) -> Iterator[Tuple[int, bytes]]:
+        """Yield (offset, record bytes) for every record in the file"""
+        with open(self.path, "rb") as warc:
+            while True:
+                offset = warc.tell()
+                if self.compressed:
+                    record = _read_gzip_member(warc)
+                else:
+                    record = _read_warc_record(warc)
+                if not record:
+                    return
+                yield offset, record
+
+
+def _read_warc_record(stream) -> bytes:
+    """Read one uncompressed WARC record (headers + block) from stream"""
+    lines = []
+    while True:
+        line = stream.readline()
+        if not line:
+            return b""
+        if line.strip() or lines:
+            lines.append(line)
+        if lines and line in (b"\r\n", b"\n"):
+            break
+
+    header = b"".join(lines)
+    length = 0
+    for line in lines:
+        name, _, value = line.decode("utf-8", "replace").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value.strip())
+    block = stream.read(length)
+    stream.read(4)  # trailing CRLF CRLF
+    return header.rstrip(b"\r\n") + b"\r\n\r\n" + block
+
+
+def _read_gzip_member(stream) -> bytes:
+    """Decompress one gzip member, leaving stream at the next member"""
+    start = stream.tell()
+    decompressor = zlib.decompressobj(wbits=31)
+    output = []
+    consumed = 0
+    while not decompressor.eof:
+        chunk = stream.read(64 * 1024)
+        if not chunk:
+            break
+        output.append(decompressor.decompress(chunk))
+        consumed += len(chunk) - len(decompressor.unused_data)
+    stream.seek(start + consumed)
+
+    record = b"".join(output)
+    if not record:
+        return b""
+    return _read_warc_record(io.BytesIO(record))
+
+
+def _warc_target(record: bytes) -> Optional[str]:
+    """Target URI of a 'response' record, or None for other record types"""
+    header = record.split(b"\r\n\r\n", 1)[0].decode("utf-8", "replace")
+    fields = {}
+    for line in header.splitlines()[1:]:
+        name, _, value = line.partition(":")
+        fields[name.strip().lower()] = value.strip()
+    if fields.get("warc-type") != "response":
+        return None
+    return fields.get("warc-target-uri", "").strip("<>") or None
+
+
+def _parse_http_response(block: bytes) -> Snapshot:
+    """
+    Split a raw HTTP response into (status, headers, body)
+
+    WARC records keep the wire bytes, so chunked and compressed bodies are
+    decoded here, before the headers describing them are dropped.
+
+    Raises:
+        ValueError: If the body uses an encoding that cannot be decoded
+    """
+    head, _, body = block.partition(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split()[1])
+    headers = {}
+    wire = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name.strip().lower() in _HOP_HEADERS:
+            wire[name.strip().lower()] = value.strip().lower()
+        else:
+            headers[name.strip()] = value.strip()
+
+    if "chunked" in wire.get("transfer-encoding", ""):
+        body = _dechunk(body)
+    # Codings are listed in the order they were applied
+    codings = [c.strip() for c in wire.get("content-encoding", "").split(",")]
+    for coding in reversed(codings):
+        body = _decode_body(body, coding)
+    return status, headers, body
+
+
+def _dechunk(body: bytes) -> bytes:
+    """Join the chunks of a chunked transfer-encoded body"""
+    stream = io.BytesIO(body)
+    chunks = []
+    while True:
+        size_line = stream.readline()
+        if not size_line:
+            break  # truncated capture: keep what arrived
+        size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+        if size == 0:
+            break
+        chunks.append(stream.read(size))
+        stream.readline()  # CRLF after the chunk
+    return b"".join(chunks)
+
+
+def _decode_body(body: bytes, coding: str) -> bytes:
+    """Undo one Content-Encoding"""
+    if coding in ("", "identity") or not body:
+        return body
+    if coding in ("gzip", "x-gzip"):
+        return zlib.decompressobj(wbits=31).decompress(body)
+    if coding == "deflate":
+        # Servers send either zlib-wrapped or raw deflate data
+        try:
+            return zlib.decompressobj().decompress(body)
+        except zlib.error:
+            return zlib.decompressobj(wbits=-15).decompress(body)
+    if coding == "br":
+        if brotli is None:
+            raise ValueError("brotli is required to replay 'br' encoded bodies")
+        return brotli.decompress(body)
+    raise ValueError(f"Unsupported Content-Encoding: {coding}")
+
+
+def open_snapshot(path: str):
+    """
+    Open a snapshot store by path
+
+    Args:
+        path: *.warc / *.warc.gz file, or a snapshot directory
+
+    Returns:
+        WarcArchive or SnapshotDirectory
+    """
+    if path.endswith(".warc") or path.endswith(".warc.gz"):
+        return WarcArchive(path)
+    return SnapshotDirectory(path)
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    requests transport adapter that answers from a snapshot store
+
+    URLs missing from the store get an empty 404 response.
+    """
+
+    def __init__(self, store):
+        """
+        Initialize replay adapter
+
+        Args:
+            store: SnapshotDirectory or WarcArchive
+        """
+        super().__init__()
+        self.store = store
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        """Build a response from the store"""
+        snapshot = self.store.get(request.url)
+        status, headers, body = snapshot if snapshot else (404, {}, b"")
+
+        response = Response()
+        response.status_code = status
+        response.reason = HTTP_REASONS.get(status, "")
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(body)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        """Nothing to release"""
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that saves every live response into a snapshot store
+    """
+
+    def __init__(self, store, max_bytes: Optional[int] = None, **kwargs):
+        """
+        Initialize recording adapter
+
+        Args:
+            store: SnapshotDirectory or WarcArchive to write to
+            max_bytes: Download cap per response (default: unlimited)
+            **kwargs: Passed to HTTPAdapter (pool sizes)
+        """
+        super().__init__(**kwargs)
+        self.store = store
+        self.max_bytes = max_bytes
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        """Send the request live and record the decoded response"""
+        response = super().send(request, **kwargs)
+        body = self._read_capped(response)
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name.lower() not in _HOP_HEADERS
+        }
+        self.store.put(request.url, response.status_code, headers, body)
+        return response
+
+    def _read_capped(self, response: Response) -> bytes:
+        """
+        Buffer a response body, stopping just past max_bytes
+
+        One byte beyond the cap is kept so the caller (live or replayed)
+        still sees that the page was truncated. The buffered body replaces
+        the stream, so callers iterate it as usual.
+        """
+        if self.max_bytes is None:
+            return response.content
+
+        limit = self.max_bytes + 1
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            chunks.append(chunk[: limit - size])
+            size += len(chunks[-1])
+            if size >= limit:
+                break
+        body = b"".join(chunks)
+
+        response.close()  # drop the rest of an oversized body
+        response._content = body
+        response._content_consumed = True
+        return body
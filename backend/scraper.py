@@ -4,10 +4,32 @@ Extracts content from any webpage with smart parsing
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse
-from typing import List, Dict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Iterator, List, Dict, Optional, Tuple, Union
+import os
+import queue
+import random
+import threading
 import time
+from backend.rate_limiter import DomainRateLimiter
+from backend.circuit_breaker import CircuitOpenError, HostCircuitBreakers
+from backend.http_cache import HTTPCache
+from backend.extractor import ContentExtractor, pool_context
+from backend.encoding import detect_encoding
+from backend.replay import RecordingAdapter, ReplayAdapter, open_snapshot
+from backend.canonical import CanonicalMap, resolve_canonical_link
+from backend.selector_cache import SelectorCache
+from backend.archive import HTMLArchive
+
+# Content types treated as HTML pages
+HTML_TYPES = {"text/html", "application/xhtml+xml"}
+
+# Status codes worth retrying (rate limited or temporarily unavailable)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
 
 
 class WebScraper:
@@ -15,10 +37,132 @@ class WebScraper:
     General-purpose web scraper with intelligent content extraction
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        requests_per_second: float = 1.0,
+        burst: int = 1,
+        pool_size_per_host: int = 10,
+        max_pooled_hosts: int = 50,
+        cache: Optional[HTTPCache] = None,
+        parser: str = "lxml",
+        restrict_parse: bool = False,
+        extraction_strategy: str = "cascade",
+        parse_workers: Optional[int] = None,
+        parse_queue_size: Optional[int] = None,
+        max_page_bytes: int = 5_000_000,
+        timeout: Union[float, Tuple[float, float]] = 15,
+        max_retries: int = 2,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        failure_threshold: int = 3,
+        circuit_reset_timeout: float = 60.0,
+        replay_from: Optional[str] = None,
+        record_to: Optional[str] = None,
+        canonical_map: Optional[CanonicalMap] = None,
+        selector_cache: Optional[SelectorCache] = None,
+        archive: Optional[HTMLArchive] = None,
+    ):
+        """
+        Initialize scraper
+
+        Args:
+            max_concurrency: Maximum number of URLs fetched at the same time
+            requests_per_second: Sustained request rate allowed per domain
+            burst: Number of back-to-back requests allowed per domain
+            pool_size_per_host: Keep-alive connections kept open per host
+            max_pooled_hosts: Number of hosts whose connection pools are kept
+            cache: Optional HTTPCache used for conditional re-fetches
+            parser: HTML parser backend ('lxml', 'html.parser', 'html5lib')
+            restrict_parse: Only parse the subtrees content extraction reads
+                (cascade strategy only)
+            extraction_strategy: 'cascade' or 'density' content extraction
+            parse_workers: Extraction processes for batch scrapes
+                (default: one per CPU core, 0 to parse in the fetch threads)
+            parse_queue_size: Downloaded pages allowed to wait for a parser
+                (default: twice parse_workers)
+            max_page_bytes: Download cap per page; longer pages are truncated
+            timeout: Request timeout in seconds, or (connect, read) tuple
+            max_retries: Retries after a connection error or 429/5xx
+                (timeouts are not retried)
+            backoff_base: First retry waits up to this many seconds; the cap
+                doubles with each attempt (full jitter)
+            backoff_max: Upper bound for a single backoff wait
+            failure_threshold: Consecutive failed requests (each after its retries)
+                before a host's circuit opens and its requests fail fast
+            circuit_reset_timeout: Seconds before an open circuit is retried
+            replay_from: Serve responses from this WARC file or snapshot
+                directory instead of the network
+            record_to: Save every live response to this WARC file or
+                snapshot directory
+            canonical_map: Optional CanonicalMap remembering where URL
+                variants (redirects, rel=canonical) lead across restarts
+                (default: remembered in memory only)
+            selector_cache: Optional SelectorCache that learns each domain's
+                article container so later pages skip generic extraction
+            archive: Optional HTMLArchive keeping raw bodies so pages can be
+                re-extracted later without re-downloading
+        """
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
         }
+        self.max_concurrency = max(1, max_concurrency)
+        self.cache = cache
+        self.canonical_map = canonical_map
+        # Without a persistent map, aliases are still remembered for the
+        # scraper's lifetime: cache entries are stored under the canonical URL
+        self._aliases = (
+            canonical_map if canonical_map is not None else CanonicalMap(":memory:")
+        )
+        self.selector_cache = selector_cache
+        self.archive = archive
+        self.max_page_bytes = max_page_bytes
+        self.extractor = ContentExtractor(
+            parser=parser, restrict=restrict_parse, strategy=extraction_strategy
+        )
+        self.rate_limiter = DomainRateLimiter(requests_per_second, burst)
+        self.timeout = timeout
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.circuit_breakers = HostCircuitBreakers(
+            failure_threshold, circuit_reset_timeout
+        )
+
+        # Shared keep-alive session: reuses TCP+TLS connections per host
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        pool_options = {
+            "pool_connections": max_pooled_hosts,
+            "pool_maxsize": pool_size_per_host,
+        }
+        if replay_from:
+            adapter = ReplayAdapter(open_snapshot(replay_from))
+        elif record_to:
+            adapter = RecordingAdapter(
+                open_snapshot(record_to), max_page_bytes, **pool_options
+            )
+        else:
+            adapter = HTTPAdapter(**pool_options)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Extraction stage: process pool started on first batch scrape
+        if parse_workers is None:
+            parse_workers = os.cpu_count() or 1
+        self.parse_workers = max(0, parse_workers)
+        self._parse_slots = threading.BoundedSemaphore(
+            parse_queue_size or max(1, 2 * self.parse_workers)
+        )
+        self._parse_pool = None
+        self._pool_lock = threading.Lock()
+
+    def close(self):
+        """Close pooled connections and stop extraction processes"""
+        self.session.close()
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown()
+            self._parse_pool = None
 
     def scrape_url(self, url: str) -> Dict[str, str]:
         """
@@ -28,127 +172,448 @@ class WebScraper:
             url: The URL to scrape
 
         Returns:
-            Dict with 'url', 'title', 'content', 'source_name'
+            Dict with 'url', 'title', 'content', 'source_name', 'success',
+            'truncated' (True if the page hit max_page_bytes)
         """
+        fetched = self._fetch(url)
+        if fetched["result"] is not None:
+            return fetched["result"]
+
         try:
-            response = requests.get(url, headers=self.headers, timeout=15)
-            response.raise_for_status()
+            extracted = self.extractor.extract(
+                fetched["body"], fetched["encoding"], fetched["selector"]
+            )
+            return self._build_result(fetched, extracted)
+        except Exception as e:
+            return self._error_result(url, fetched["source_name"], e)
+
+    def scrape_multiple(self, urls: List[str]) -> List[Dict[str, str]]:
+        """
+        Scrape multiple URLs concurrently with rate limiting
+
+        Pages are downloaded by a thread pool and, when parse_workers is
+        set, parsed in a process pool so extraction scales with cores.
 
-            soup = BeautifulSoup(response.text, "html.parser")
+        Args:
+            urls: List of URLs to scrape
 
-            # Extract title
-            title = self._extract_title(soup)
+        Returns:
+            List of scraped content dictionaries, in the same order as urls
+        """
+        results = [None] * len(urls)
+        for index, result in self._stream(urls):
+            results[index] = result
+        return results
 
-            # Extract main content
-            content = self._extract_content(soup)
+    def scrape_stream(self, urls: List[str]) -> Iterator[Dict[str, str]]:
+        """
+        Scrape multiple URLs concurrently, yielding each result as soon as
+        it is ready
 
-            # Extract source name from URL
-            source_name = urlparse(url).netloc.replace("www.", "")
+        Works like scrape_multiple() but in completion order, so callers
+        can start processing before the slowest page arrives. Closing the
+        generator early cancels URLs that have not started downloading.
 
+        Args:
+            urls: List of URLs to scrape
+
+        Yields:
+            Scraped content dictionaries (see scrape_url), in completion order
+        """
+        for _, result in self._stream(urls):
+            yield result
+
+    def _stream(self, urls: List[str]) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """Yield (index into urls, result) pairs in completion order"""
+        if not urls:
+            return
+
+        use_pool = len(urls) > 1 and self.parse_workers > 0
+        done = queue.Queue()
+
+        def on_fetched(index: int, future: Future):
+            if future.cancelled():
+                return
+            try:
+                outcome = future.result()
+            except Exception as e:
+                done.put((index, None, e))
+                return
+
+            if not use_pool:
+                done.put((index, outcome, None))
+                return
+
+            fetched, parse_future = outcome
+            if parse_future is None:
+                done.put((index, fetched["result"], None))
+            else:
+                # Done-callbacks run on the pool's single manager thread, so
+                # the result is built by the consumer below, not here
+                parse_future.add_done_callback(
+                    lambda _: done.put((index, (fetched, parse_future), None))
+                )
+
+        workers = min(self.max_concurrency, len(urls))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            # Submit hosts round-robin so workers don't all queue on one domain
+            for index in self._interleave_by_domain(urls):
+                if use_pool:
+                    future = executor.submit(self._fetch_and_submit, urls[index])
+                else:
+                    future = executor.submit(self.scrape_url, urls[index])
+                future.add_done_callback(partial(on_fetched, index))
+
+            for _ in range(len(urls)):
+                index, result, error = done.get()
+                if error is not None:
+                    url = urls[index]
+                    result = self._error_result(url, _source_name(url), error)
+                elif isinstance(result, tuple):
+                    result = self._collect(*result)
+                yield index, result
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def fetch_raw(self, url: str, headers: Optional[Dict] = None) -> Dict:
+        """
+        Download a non-article resource (feed, sitemap) through the shared
+        session and per-domain rate limiter
+
+        Args:
+            url: URL to fetch
+            headers: Extra request headers (e.g. conditional GET validators)
+
+        Returns:
+            Dict with 'status', 'headers', 'body' (capped at max_page_bytes)
+
+        Raises:
+            requests.RequestException: On network errors and 4xx/5xx responses
+            CircuitOpenError: If the host's circuit is open
+        """
+        with self._request(url, headers or {}) as response:
+            if response.status_code == 304:
+                return {"status": 304, "headers": response.headers, "body": b""}
+
+            response.raise_for_status()
+            body, _ = self._read_body(response)
             return {
-                "url": url,
-                "title": title,
-                "content": content,
-                "source_name": source_name,
-                "success": True,
+                "status": response.status_code,
+                "headers": response.headers,
+                "body": body,
             }
 
+    def _fetch(self, url: str) -> Dict:
+        """
+        Network stage: download a page (or revalidate it against the cache)
+
+        Returns:
+            Dict with 'url', 'source_name', 'body', 'encoding', response metadata, and
+            'result' set when no extraction is needed (error or cache hit)
+        """
+        # Known variants go straight to their canonical URL and cache entry
+        target = self._aliases.resolve(url)
+        source_name = _source_name(target)
+        fetched = {
+            "requested_url": url,
+            "url": target,
+            "source_name": source_name,
+            "result": None,
+        }
+
+        try:
+            cached = self.cache.get(target) if self.cache else None
+
+            # Revalidate cached pages with a conditional GET
+            request_headers = {}
+            if cached:
+                if cached["etag"]:
+                    request_headers["If-None-Match"] = cached["etag"]
+                if cached["last_modified"]:
+                    request_headers["If-Modified-Since"] = cached["last_modified"]
+
+            with self._request(target, request_headers) as response:
+                # Not modified: reuse the previous extraction without parsing
+                if cached and response.status_code == 304:
+                    self.cache.record_hit()
+                    fetched["result"] = {
+                        "url": target,
+                        "title": cached["title"],
+                        "content": cached["content"],
+                        "source_name": source_name,
+                        "success": True,
+                        "truncated": False,
+                    }
+                    return fetched
+
+                response.raise_for_status()
+
+                # Check the type before downloading anything
+                content_type = response.headers.get("Content-Type", "")
+                mime_type = content_type.split(";")[0].strip().lower()
+                if mime_type and mime_type not in HTML_TYPES:
+                    raise ValueError(f"Unsupported content type: {mime_type}")
+
+                body, truncated = self._read_body(response)
+
+            # Header, BOM or <meta> only; the parser decodes the bytes once
+            fetched["encoding"], _ = detect_encoding(content_type, body)
+            fetched["selector"] = (
+                self.selector_cache.get(urlparse(target).netloc)
+                if self.selector_cache is not None
+                else None
+            )
+            fetched["body"] = body
+            fetched["final_url"] = response.url
+            fetched["redirect_hosts"] = [
+                urlparse(hop.url).hostname for hop in response.history
+            ]
+            fetched["truncated"] = truncated
+            fetched["etag"] = response.headers.get("ETag")
+            fetched["last_modified"] = response.headers.get("Last-Modified")
+            return fetched
+
         except Exception as e:
-            return {
-                "url": url,
-                "title": "Error",
-                "content": f"Failed to scrape: {str(e)}",
-                "source_name": urlparse(url).netloc.replace("www.", ""),
-                "success": False,
-            }
+            fetched["result"] = self._error_result(url, source_name, e)
+            return fetched
 
-    def scrape_multiple(self, urls: List[str]) -> List[Dict[str, str]]:
+    def _request(self, url: str, headers: Dict) -> requests.Response:
         """
-        Scrape multiple URLs with rate limiting
+        Send a streamed GET with rate limiting, retries and circuit breaking
 
-        Args:
-            urls: List of URLs to scrape
+        Connection errors and 429/5xx responses are retried with jittered
+        exponential backoff; a request that still fails after its retries
+        counts as one failure for the host's circuit breaker. Timeouts are
+        not retried, since a hung host would cost a full timeout per
+        attempt, and each one counts as a failure right away, so the
+        circuit opens after the first few. The final 429/5xx response is
+        returned as-is.
+
+        Raises:
+            CircuitOpenError: If the host's circuit is open
+            requests.RequestException: If the last attempt failed
+        """
+        netloc = urlparse(url).netloc
+        breaker = self.circuit_breakers.get(netloc)
+        if not breaker.allow_request():
+            raise CircuitOpenError(f"Circuit open for {netloc}, failing fast")
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire(netloc)
+            try:
+                response = self.session.get(
+                    url, headers=headers, timeout=self.timeout, stream=True
+                )
+            except requests.Timeout:
+                breaker.record_failure()
+                raise
+            except requests.ConnectionError:
+                if attempt == self.max_retries:
+                    breaker.record_failure()
+                    raise
+                self._backoff(attempt)
+                continue
+            except Exception:
+                breaker.release()
+                raise
+
+            if response.status_code not in RETRY_STATUSES:
+                breaker.record_success()
+                return response
+
+            if attempt == self.max_retries:
+                breaker.record_failure()
+                return response
+
+            retry_after = response.headers.get("Retry-After", "")
+            response.close()
+            self._backoff(attempt, retry_after)
+
+    def _backoff(self, attempt: int, retry_after: str = ""):
+        """Sleep before a retry: Retry-After if given, else full jitter"""
+        if retry_after.isdigit():
+            delay = float(retry_after)
+        else:
+            delay = random.uniform(0, self.backoff_base * 2**attempt)
+        time.sleep(min(delay, self.backoff_max))
+
+    def _read_body(self, response: requests.Response) -> Tuple[bytes, bool]:
+        """
+        Read a streamed response body up to max_page_bytes
 
         Returns:
-            List of scraped content dictionaries
+            Tuple of (body, truncated)
         """
-        results = []
-        for url in urls:
-            result = self.scrape_url(url)
-            results.append(result)
-            time.sleep(1)  # Rate limiting
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            if size + len(chunk) > self.max_page_bytes:
+                chunks.append(chunk[: self.max_page_bytes - size])
+                return b"".join(chunks), True
+            chunks.append(chunk)
+            size += len(chunk)
 
-        return results
+        return b"".join(chunks), False
 
-    def _extract_title(self, soup: BeautifulSoup) -> str:
-        """Extract page title with fallbacks"""
-        # Try multiple title sources
-        title_tags = [
-            soup.find("h1"),
-            soup.find("title"),
-            soup.find("meta", property="og:title"),
-        ]
-
-        for tag in title_tags:
-            if tag:
-                if tag.name == "meta":
-                    return tag.get("content", "Unknown Title")
-                return tag.get_text().strip()
-
-        return "Unknown Title"
-
-    def _extract_content(self, soup: BeautifulSoup) -> str:
-        """
-        Extract main content with intelligent parsing
-        Tries multiple strategies to find article content
-        """
-        # Remove unwanted elements
-        for element in soup(["script", "style", "nav", "header", "footer", "aside"]):
-            element.decompose()
-
-        # Strategy 1: Look for article tag
-        article = soup.find("article")
-        if article:
-            paragraphs = article.find_all("p")
-            if paragraphs:
-                return "\n\n".join(
-                    [
-                        p.get_text().strip()
-                        for p in paragraphs
-                        if len(p.get_text().strip()) > 50
-                    ]
-                )
+    def _build_result(self, fetched: Dict, extracted: Dict) -> Dict[str, str]:
+        """
+        Combine a fetched page with its extraction and update the cache
+
+        The result is keyed by the page's canonical URL: its rel=canonical
+        link if usable, else where redirects ended up.
+        """
+        canonical = resolve_canonical_link(
+            fetched["final_url"],
+            extracted.get("canonical", ""),
+            [urlparse(fetched["url"]).hostname, *fetched["redirect_hosts"]],
+        )
+        if self.selector_cache is not None:
+            self.selector_cache.record(
+                urlparse(fetched["url"]).netloc,
+                extracted["selector"],
+                fetched["selector"],
+            )
 
-        # Strategy 2: Look for main content div
-        main_content = soup.find("main") or soup.find(
-            "div",
-            class_=["main-content", "article-content", "post-content", "entry-content"],
+        self._aliases.record(
+            [fetched["requested_url"], fetched["url"], fetched["final_url"]],
+            canonical,
         )
-        if main_content:
-            paragraphs = main_content.find_all("p")
-            if paragraphs:
-                return "\n\n".join(
-                    [
-                        p.get_text().strip()
-                        for p in paragraphs
-                        if len(p.get_text().strip()) > 50
-                    ]
+
+        if self.archive is not None:
+            self.archive.put(
+                canonical,
+                fetched["body"],
+                fetched["encoding"],
+                extracted["title"],
+                extracted["content"],
+            )
+
+        if self.cache:
+            self.cache.record_miss()
+
+        # Truncated pages are not cached so a hit never hides the truncation
+        if self.cache and not fetched["truncated"]:
+            self.cache.put(
+                canonical,
+                fetched["body"],
+                extracted["title"],
+                extracted["content"],
+                etag=fetched["etag"],
+                last_modified=fetched["last_modified"],
+            )
+
+        return {
+            "url": canonical,
+            "title": extracted["title"],
+            "content": extracted["content"],
+            "source_name": _source_name(canonical),
+            "success": True,
+            "truncated": fetched["truncated"],
+        }
+
+    def _error_result(
+        self, url: str, source_name: str, error: Exception
+    ) -> Dict[str, str]:
+        """Result dict for a page that could not be scraped"""
+        return {
+            "url": url,
+            "title": "Error",
+            "content": f"Failed to scrape: {str(error)}",
+            "source_name": source_name,
+            "success": False,
+            "truncated": False,
+        }
+
+    def _fetch_and_submit(self, url: str) -> Tuple:
+        """
+        Fetch a page and queue its extraction in the process pool
+
+        Blocks while the parse queue is full, so downloads cannot run
+        arbitrarily far ahead of parsing. A pool that broke (a worker died)
+        or was shut down is replaced and the page submitted once more.
+        """
+        fetched = self._fetch(url)
+        if fetched["result"] is not None:
+            return fetched, None
+
+        self._parse_slots.acquire()
+        try:
+            for attempt in range(2):
+                parse_pool = self._get_parse_pool()
+                try:
+                    future = parse_pool.submit(
+                        self.extractor.extract,
+                        fetched["body"],
+                        fetched["encoding"],
+                        fetched["selector"],
+                    )
+                    fetched["parse_pool"] = parse_pool
+                    break
+                except RuntimeError:  # BrokenProcessPool, or shut down
+                    self._discard_parse_pool(parse_pool)
+                    if attempt:
+                        raise
+        except Exception:
+            self._parse_slots.release()
+            raise
+        future.add_done_callback(lambda _: self._parse_slots.release())
+        return fetched, future
+
+    def _collect(self, fetched: Dict, parse_future: Optional[Future]) -> Dict:
+        """Wait for a queued extraction and build the result"""
+        if parse_future is None:
+            return fetched["result"]
+
+        try:
+            return self._build_result(fetched, parse_future.result())
+        except BrokenProcessPool as e:
+            # A worker died; pages it took down with it fail, later ones
+            # go to a fresh pool
+            self._discard_parse_pool(fetched["parse_pool"])
+            return self._error_result(
+                fetched["requested_url"], fetched["source_name"], e
+            )
+        except Exception as e:
+            return self._error_result(
+                fetched["requested_url"], fetched["source_name"], e
+            )
+
+    def _get_parse_pool(self) -> ProcessPoolExecutor:
+        """Lazily start the extraction process pool"""
+        with self._pool_lock:
+            if self._parse_pool is None:
+                self._parse_pool = ProcessPoolExecutor(
+                    max_workers=self.parse_workers, mp_context=pool_context()
                 )
+            return self._parse_pool
+
+    def _discard_parse_pool(self, parse_pool: ProcessPoolExecutor):
+        """Drop a broken pool so the next submit starts a new one"""
+        with self._pool_lock:
+            if self._parse_pool is not parse_pool:
+                return  # already replaced by another thread
+            self._parse_pool = None
+        parse_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _interleave_by_domain(self, urls: List[str]) -> List[int]:
+        """Order URL indices round-robin across domains"""
+        by_domain = {}
+        for index, url in enumerate(urls):
+            by_domain.setdefault(urlparse(url).netloc, []).append(index)
+
+        order = []
+        pending = list(by_domain.values())
+        while pending:
+            order.extend(indices.pop(0) for indices in pending)
+            pending = [indices for indices in pending if indices]
+
+        return order
 
-        # Strategy 3: Get all paragraphs (fallback)
-        paragraphs = soup.find_all("p")
-        if paragraphs:
-            # Filter out short paragraphs (likely navigation/ads)
-            content_paras = [
-                p.get_text().strip()
-                for p in paragraphs
-                if len(p.get_text().strip()) > 50
-            ]
-            return "\n\n".join(
-                content_paras[:20]
-            )  # Limit to first 20 substantial paragraphs
 
-        return "Could not extract content from this page."
+def _source_name(url: str) -> str:
+    """Site name shown for a URL (host without 'www.')"""
+    return urlparse(url).netloc.replace("www.", "")
 
 
 # Quick test function
@@ -0,0 +1,170 @@
+"""
+Selector Cache Module - Per-Domain Learned Extraction Selectors
+Learns which container holds the article body on each publisher's
+template, so later pages skip the generic extraction path
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from backend.extractor import BARE_SELECTOR_TAGS
+
+
+class SelectorCache:
+    """
+    Container selectors learned per domain, persisted to a JSON file
+
+    A selector is learned once the generic extractor has found the article
+    in the same container on min_pages pages of a domain, and that
+    container accounts for at least min_agreement of the domain's pages.
+    A learned selector that comes up empty max_misses times in a row is
+    dropped (the template changed) and learning starts over.
+    """
+
+    def __init__(
+        self,
+        path: str = "data/selectors.json",
+        min_pages: int = 3,
+        min_agreement: float = 0.8,
+        max_misses: int = 3,
+    ):
+        """
+        Initialize selector cache
+
+        Args:
+            path: JSON file holding learned selectors and their evidence
+            min_pages: Pages that must agree before a selector is used
+            min_agreement: Share of observed pages the selector must cover
+            max_misses: Consecutive misses before a learned selector is dropped
+        """
+        self.path = Path(path)
+        self.min_pages = min_pages
+        self.min_agreement = min_agreement
+        self.max_misses = max_misses
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._state = self._load_state()
+
+    def get(self, domain: str) -> Optional[str]:
+        """
+        Learned selector for a domain
+
+        Args:
+            domain: Host name
+
+        Returns:
+            CSS selector, or None while still learning
+        """
+        with self._lock:
+            return self._state.get(domain, {}).get("selector")
+
+    def record(self, domain: str, selector: str, tried: Optional[str] = None):
+        """
+        Record where the article body of a page was found
+
+        Args:
+            domain: Host name
+            selector: Container the content came from ('' if none)
+            tried: Learned selector that was tried first, if any
+        """
+        changed = False
+        with self._lock:
+            entry = self._state.setdefault(
+                domain, {"selector": None, "counts": {}, "misses": 0}
+            )
+
+            if tried:
+                if selector == tried:
+                    self.hits += 1
+                    entry["misses"] = 0
+                    return
+
+                self.misses += 1
+                entry["misses"] += 1
+                if entry["misses"] >= self.max_misses:
+                    entry.update({"selector": None, "counts": {}, "misses": 0})
+                    changed = True
+
+            if entry["selector"] is None:
+                counts = entry["counts"]
+                key = selector or ""
+                counts[key] = counts.get(key, 0) + 1
+
+                best = max(counts, key=counts.get)
+                total = sum(counts.values())
+                if (
+                    _specific(best)
+                    and counts[best] >= self.min_pages
+                    and counts[best] / total >= self.min_agreement
+                ):
+                    entry.update({"selector": best, "counts": {}, "misses": 0})
+                    changed = True
+
+        # Only learning events are written; evidence for pending domains is
+        # saved with them or by save()
+        if changed:
+            self.save()
+
+    def forget(self, domain: Optional[str] = None):
+        """
+        Drop learned selectors
+
+        Args:
+            domain: Domain to forget (default: all domains)
+        """
+        with self._lock:
+            if domain is None:
+                self._state = {}
+            else:
+                self._state.pop(domain, None)
+        self.save()
+
+    def stats(self) -> Dict:
+        """
+        Get selector statistics
+
+        Returns:
+            Dict with 'domains' (with a learned selector), 'learning',
+            'hits', 'misses'
+        """
+        with self._lock:
+            learned = sum(1 for entry in self._state.values() if entry["selector"])
+            return {
+                "domains": learned,
+                "learning": len(self._state) - learned,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def save(self):
+        """Write selectors to disk atomically"""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(self._state), encoding="utf-8")
+            tmp_path.replace(self.path)
+
+    def _load_state(self) -> Dict:
+        """Read selectors from disk"""
+        if not self.path.exists():
+            return {}
+        try:
+            state = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+        # Earlier versions could learn bare tags such as 'div'; relearn those
+        for entry in state.values():
+            if entry["selector"] and not _specific(entry["selector"]):
+                entry.update({"selector": None, "counts": {}, "misses": 0})
+        return state
+
+
+def _specific(selector: str) -> bool:
+    """True for selectors that can pin down one container on a page"""
+    return bool(selector) and (
+        "#" in selector or "." in selector or selector in BARE_SELECTOR_TAGS
+    )
@@ -0,0 +1,122 @@
+"""
+Benchmark script for embedding throughput
+
+Usage:
+    python benchmark_embeddings.py [chunks] [parallel] [overhead_ms] [per_text_ms]
+
+Starts a local stand-in for Ollama's /api/embed endpoint and measures
+chunks/sec for the single-request path (OllamaEmbeddings.embed_documents on
+every chunk at once) against EmbeddingExecutor at several batch sizes and
+concurrency levels. The stand-in serves up to `parallel` requests at once
+(like OLLAMA_NUM_PARALLEL) and takes overhead_ms + per_text_ms * texts per
+request, so results depend only on those settings, not on a GPU.
+"""
+
+import hashlib
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from langchain_ollama import OllamaEmbeddings
+
+from backend.embedding_executor import EmbeddingExecutor
+
+DIMENSIONS = 768
+
+
+def fake_vector(text: str) -> list:
+    """Deterministic stand-in vector for a text"""
+    seed = hashlib.sha256(text.encode("utf-8")).digest()
+    return [seed[i % len(seed)] / 255 for i in range(DIMENSIONS)]
+
+
+def start_server(parallel: int, overhead_ms: float, per_text_ms: float):
+    """Serve /api/embed on a free local port; returns the server"""
+    slots = threading.Semaphore(parallel)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            texts = request["input"]
+            if isinstance(texts, str):
+                texts = [texts]
+
+            with slots:
+                time.sleep((overhead_ms + per_text_ms * len(texts)) / 1000)
+                body = json.dumps(
+                    {
+                        "model": request["model"],
+                        "embeddings": [fake_vector(text) for text in texts],
+                    }
+                ).encode("utf-8")
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_chunks(count: int) -> list:
+    """Distinct chunk-sized texts"""
+    sentence = "The committee published its findings on regional transport. "
+    return [f"Chunk {i}. " + sentence * 15 for i in range(count)]
+
+
+def bench_embeddings(chunks: list, base_url: str):
+    """Time the single-request path and the executor grid"""
+    ollama = OllamaEmbeddings(model="stand-in", base_url=base_url)
+
+    print(f"\n🧮 Embedding throughput ({len(chunks)} chunks)")
+    print(f"  {'mode':<32}{'chunks/s':>10}{'seconds':>10}")
+
+    start = time.perf_counter()
+    ollama.embed_documents(chunks)
+    elapsed = time.perf_counter() - start
+    print(
+        f"  {'single request (before)':<32}{len(chunks) / elapsed:>10.1f}{elapsed:>10.2f}"
+    )
+
+    for batch_size in (16, 32, 64):
+        for concurrency in (1, 4, 8):
+            executor = EmbeddingExecutor(
+                ollama, batch_size=batch_size, concurrency=concurrency
+            )
+            start = time.perf_counter()
+            vectors = executor.embed_documents(chunks)
+            elapsed = time.perf_counter() - start
+            assert len(vectors) == len(chunks)
+
+            label = f"batch {batch_size}, {concurrency} in flight"
+            print(f"  {label:<32}{len(chunks) / elapsed:>10.1f}{elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and not sys.argv[1].isdigit():
+        print(__doc__)
+        sys.exit(1)
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    parallel = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    overhead_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 20.0
+    per_text_ms = float(sys.argv[4]) if len(sys.argv) > 4 else 2.0
+
+    server = start_server(parallel, overhead_ms, per_text_ms)
+    print(
+        f"Stand-in server: {parallel} parallel slots,"
+        f" {overhead_ms:g} ms + {per_text_ms:g} ms/text per request"
+    )
+    try:
+        bench_embeddings(make_chunks(count), f"http://127.0.0.1:{server.server_port}")
+    finally:
+        server.shutdown()
@@ -0,0 +1,313 @@
+"""
+Benchmark script for HTML parsing and content extraction
+
+Usage:
+    python benchmark_scraper.py <pages_dir | snapshot> [repeat]
+
+pages_dir holds saved pages (*.html, searched recursively). A page may
+have a sibling <name>.txt with the expected article text, which is used to
+score extraction quality. A snapshot is a WARC file or snapshot directory
+recorded with WebScraper(record_to=...); it is additionally replayed
+through the full WebScraper pipeline. Nothing is fetched from the network,
+so runs are repeatable.
+
+benchmark_pages/ holds 30 small pages whose article bodies sit in
+unlabeled containers next to link lists and promos, each with its
+expected text, for comparing extraction strategies:
+
+    python benchmark_scraper.py benchmark_pages
+
+Those pages share no template, so no container selector is learned from
+them. benchmark_sites/ holds six stories from each of three sites, one
+folder per site, whose templates differ (div.class, bare <article>,
+div#id inside <main>) and carry menus, comments and scripts around the
+story; selectors are learned per folder and the learned column shows the
+speedup of parsing only the container:
+
+    python benchmark_scraper.py benchmark_sites
+"""
+
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from urllib.parse import urlparse
+
+from backend.encoding import decode_body, detect_encoding
+from backend.extractor import ContentExtractor, PARSERS, STRATEGIES
+from backend.replay import open_snapshot
+from backend.scraper import WebScraper
+from backend.selector_cache import SelectorCache
+
+
+def is_snapshot(path: str) -> bool:
+    """True for WARC files and recorded snapshot directories"""
+    return path.endswith((".warc", ".warc.gz")) or (Path(path) / "index.jsonl").exists()
+
+
+def load_raw_pages(pages_dir: str) -> list:
+    """Load saved pages as (content_type, body bytes) pairs"""
+    if is_snapshot(pages_dir):
+        store = open_snapshot(pages_dir)
+        snapshots = [store.get(url) for url in store.urls()]
+        return [
+            (headers.get("Content-Type", ""), body)
+            for status, headers, body in snapshots
+            if status == 200
+        ]
+
+    paths = sorted(Path(pages_dir).rglob("*.html"))
+    return [("", path.read_bytes()) for path in paths]
+
+
+def load_pages(pages_dir: str) -> list:
+    """Load saved HTML pages as text"""
+    pages = []
+    for content_type, body in load_raw_pages(pages_dir):
+        encoding, _ = detect_encoding(content_type, body)
+        pages.append(decode_body(body, encoding))
+    return pages
+
+
+def load_sites(pages_dir: str) -> list:
+    """Site per page: the URL's host for snapshots, else the page's folder"""
+    if is_snapshot(pages_dir):
+        store = open_snapshot(pages_dir)
+        return [
+            urlparse(url).netloc for url in store.urls() if store.get(url)[0] == 200
+        ]
+    return [path.parent.name for path in sorted(Path(pages_dir).rglob("*.html"))]
+
+
+def load_expected(pages_dir: str) -> list:
+    """Expected article text per page (None when no .txt sibling exists)"""
+    if is_snapshot(pages_dir):
+        return [None] * len(load_pages(pages_dir))
+
+    expected = []
+    for path in sorted(Path(pages_dir).rglob("*.html")):
+        gold = path.with_suffix(".txt")
+        expected.append(gold.read_text(encoding="utf-8") if gold.exists() else None)
+    return expected
+
+
+def token_f1(extracted: str, expected: str) -> float:
+    """Bag-of-words F1 between extracted and expected text"""
+    got = re.findall(r"\w+", extracted.lower())
+    want = re.findall(r"\w+", expected.lower())
+    if not got or not want:
+        return 0.0
+
+    counts = {}
+    for token in want:
+        counts[token] = counts.get(token, 0) + 1
+    overlap = 0
+    for token in got:
+        if counts.get(token, 0) > 0:
+            counts[token] -= 1
+            overlap += 1
+
+    if not overlap:
+        return 0.0
+    precision = overlap / len(got)
+    recall = overlap / len(want)
+    return 2 * precision * recall / (precision + recall)
+
+
+def available_parsers() -> list:
+    """Parser backends installed in this environment"""
+    from bs4 import BeautifulSoup
+
+    parsers = []
+    for parser in PARSERS:
+        try:
+            BeautifulSoup("<p>x</p>", parser)
+            parsers.append(parser)
+        except Exception:
+            pass
+    return parsers
+
+
+def bench_parsers(pages: list, repeat: int = 3):
+    """Time and measure peak memory of each parser backend"""
+    print(f"\n⏱️  Parser backends ({len(pages)} pages, best of {repeat})")
+    print(f"  {'backend':<24}{'ms/page':>10}{'peak MB':>10}")
+
+    for parser in available_parsers():
+        for restrict in (False, True):
+            extractor = ContentExtractor(parser=parser, restrict=restrict)
+
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                for html in pages:
+                    extractor.extract(html)
+                best = min(best, time.perf_counter() - start)
+
+            # Peak memory of the largest single page
+            peak = 0
+            for html in pages:
+                tracemalloc.start()
+                extractor.extract(html)
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+
+            label = f"{parser}{' (restricted)' if restrict else ''}"
+            print(f"  {label:<24}{best / len(pages) * 1000:>10.2f}{peak / 1e6:>10.2f}")
+
+
+def bench_strategies(pages: list, expected: list, repeat: int = 3):
+    """Compare content extraction strategies for speed and quality"""
+    scored = sum(1 for gold in expected if gold is not None)
+    print(
+        f"\n🎯 Extraction strategies ({scored}/{len(pages)} pages with expected text)"
+    )
+    print(f"  {'strategy':<24}{'ms/page':>10}{'mean F1':>10}")
+
+    for strategy in STRATEGIES:
+        extractor = ContentExtractor(strategy=strategy)
+
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results = [extractor.extract(html) for html in pages]
+            best = min(best, time.perf_counter() - start)
+
+        scores = [
+            token_f1(result["content"], gold)
+            for result, gold in zip(results, expected)
+            if gold is not None
+        ]
+        quality = f"{sum(scores) / len(scores):.3f}" if scores else "n/a"
+        print(f"  {strategy:<24}{best / len(pages) * 1000:>10.2f}{quality:>10}")
+
+
+def bench_selectors(pages: list, sites: list, repeat: int = 3):
+    """
+    Compare generic extraction with per-site learned container selectors
+
+    Selectors are learned from the first pages of each site the way
+    WebScraper does it; every page is then extracted with and without the
+    learned selector. Agreement is token F1 against the generic output.
+    """
+    print(f"\n🧭 Learned selectors ({len(pages)} pages, best of {repeat})")
+    print(
+        f"  {'strategy':<12}{'generic':>10}{'learned':>10}{'speedup':>10}"
+        f"{'agree':>8}  selectors"
+    )
+
+    for strategy in STRATEGIES:
+        extractor = ContentExtractor(strategy=strategy)
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = SelectorCache(str(Path(tmp) / "selectors.json"))
+            for html, site in zip(pages, sites):
+                selector = cache.get(site)
+                result = extractor.extract(html, selector=selector)
+                cache.record(site, result["selector"], selector)
+            selectors = [cache.get(site) for site in sites]
+
+        timings = {}
+        outputs = {}
+        for label, chosen in (("generic", [None] * len(pages)), ("learned", selectors)):
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                outputs[label] = [
+                    extractor.extract(html, selector=selector)["content"]
+                    for html, selector in zip(pages, chosen)
+                ]
+                best = min(best, time.perf_counter() - start)
+            timings[label] = best / len(pages) * 1000
+
+        agree = sum(
+            token_f1(learned, generic) if generic else float(not learned)
+            for learned, generic in zip(outputs["learned"], outputs["generic"])
+        ) / len(pages)
+        learned = sorted({selector for selector in selectors if selector})
+        print(
+            f"  {strategy:<12}{timings['generic']:>10.2f}{timings['learned']:>10.2f}"
+            f"{timings['generic'] / timings['learned']:>9.2f}x{agree:>8.3f}"
+            f"  {', '.join(learned) or 'none learned'}"
+        )
+
+
+def bench_decoding(raw_pages: list, repeat: int = 3):
+    """
+    Compare charset handling: statistical detection over the whole body
+    (what requests' response.text does when the header has no charset)
+    against header/BOM/<meta> sniffing with bytes handed to lxml
+    """
+    from requests.compat import chardet
+
+    extractor = ContentExtractor(parser="lxml")
+    print(f"\n🔤 Charset detection + parse ({len(raw_pages)} pages, best of {repeat})")
+    print(f"  {'path':<24}{'ms/page':>10}")
+
+    def statistical():
+        for _, body in raw_pages:
+            encoding = chardet.detect(body)["encoding"] or "utf-8"
+            extractor.extract(body.decode(encoding, errors="replace"))
+
+    def sniffed():
+        for content_type, body in raw_pages:
+            encoding, _ = detect_encoding(content_type, body)
+            extractor.extract(body, encoding)
+
+    timings = {}
+    for label, run in (
+        ("statistical + decode", statistical),
+        ("sniff + bytes", sniffed),
+    ):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+        timings[label] = best / len(raw_pages) * 1000
+        print(f"  {label:<24}{timings[label]:>10.2f}")
+
+    saved = timings["statistical + decode"] - timings["sniff + bytes"]
+    print(f"  {'saved per page':<24}{saved:>10.2f}")
+
+
+def bench_replay(snapshot: str):
+    """Scrape every URL of a snapshot through the full WebScraper pipeline"""
+    urls = open_snapshot(snapshot).urls()
+    print(f"\n🔁 Replayed scrape ({len(urls)} URLs, no network)")
+    print(f"  {'mode':<24}{'pages/s':>10}")
+
+    for label, parse_workers in (("parse in threads", 0), ("parse in processes", None)):
+        scraper = WebScraper(
+            requests_per_second=1e9,
+            burst=len(urls),
+            parse_workers=parse_workers,
+            replay_from=snapshot,
+        )
+        scraper.scrape_multiple(urls[:2])  # warm up the process pool
+
+        start = time.perf_counter()
+        scraper.scrape_multiple(urls)
+        elapsed = time.perf_counter() - start
+        scraper.close()
+        print(f"  {label:<24}{len(urls) / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    pages = load_pages(sys.argv[1])
+    if not pages:
+        print(f"No *.html pages found in {sys.argv[1]}")
+        sys.exit(1)
+
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    bench_parsers(pages, repeat)
+    bench_strategies(pages, load_expected(sys.argv[1]), repeat)
+    bench_selectors(pages, load_sites(sys.argv[1]), repeat)
+    bench_decoding(load_raw_pages(sys.argv[1]), repeat)
+    if is_snapshot(sys.argv[1]):
+        bench_replay(sys.argv[1])
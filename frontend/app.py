@@ -4,15 +4,27 @@ Interactive UI for RAG-based news/content analysis
 """
 
 import streamlit as st
+import shutil
 import sys
 from pathlib import Path
+from typing import Dict, List
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Local storage for caches and indexes
+DATA_DIR = Path(__file__).parent.parent / "data"
+VECTOR_STORE_DIR = DATA_DIR / "vector_store"
+
 
 from backend.scraper import WebScraper
-from backend.rag_pipeline import RAGPipeline
+from backend.http_cache import HTTPCache
+from backend.canonical import CanonicalMap
+from backend.selector_cache import SelectorCache
+from backend.archive import HTMLArchive
+from backend.feeds import FeedIngester
+from backend.rag_pipeline import RAGPipeline, StaleSaveError, has_saved_index
+from backend.embedding_cache import EmbeddingCache
 from backend.chat_engine import ChatEngine
 
 # Page config
@@ -57,15 +69,91 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
+
+@st.cache_resource
+def get_scraper() -> WebScraper:
+    """Shared scraper so pooled connections survive reruns and sessions"""
+    return WebScraper(
+        cache=HTTPCache(str(DATA_DIR / "http_cache.sqlite3")),
+        canonical_map=CanonicalMap(str(DATA_DIR / "canonical_map.sqlite3")),
+        selector_cache=SelectorCache(str(DATA_DIR / "selectors.json")),
+        archive=HTMLArchive(str(DATA_DIR / "archive")),
+    )
+
+
+@st.cache_resource
+def get_embedding_cache() -> EmbeddingCache:
+    """Shared embedding cache; known chunks are never re-embedded"""
+    return EmbeddingCache(str(DATA_DIR / "embedding_cache.sqlite3"))
+
+
+@st.cache_resource
+def get_feed_ingester() -> FeedIngester:
+    """Shared feed ingester; cursors persist across restarts"""
+    return FeedIngester(get_scraper(), str(DATA_DIR / "feed_state.json"))
+
+
+def load_saved_pipeline():
+    """Pipeline saved by an earlier session, or None"""
+    if not has_saved_index(str(VECTOR_STORE_DIR)):
+        return None
+    pipeline = RAGPipeline(embedding_cache=get_embedding_cache())
+    try:
+        pipeline.load(str(VECTOR_STORE_DIR))
+    except Exception as e:
+        # Corrupt or outdated save: start empty rather than break the app
+        print(f"⚠️ Could not load saved vector store: {e}")
+        return None
+    return pipeline
+
+
+def save_pipeline(pipeline: RAGPipeline, articles: List[Dict]) -> RAGPipeline:
+    """
+    Save a session's pipeline without overwriting other sessions' saves
+
+    If another session saved since this pipeline was loaded, its save is
+    loaded and these articles re-applied to it (their vectors come from the
+    embedding cache), so neither session's articles are lost.
+
+    Returns:
+        The pipeline that was saved
+    """
+    for _ in range(3):
+        try:
+            pipeline.save(str(VECTOR_STORE_DIR))
+            return pipeline
+        except StaleSaveError:
+            newer = load_saved_pipeline()
+            if newer is None:
+                # The other save is unreadable; ours replaces it
+                pipeline.save(str(VECTOR_STORE_DIR), force=True)
+                return pipeline
+            newer.refresh_documents(articles)
+            pipeline = newer
+    pipeline.save(str(VECTOR_STORE_DIR), force=True)
+    return pipeline
+
+
 # Initialize session state
 if "rag_pipeline" not in st.session_state:
-    st.session_state.rag_pipeline = None
+    # Pick up where the last session left off instead of re-embedding
+    st.session_state.rag_pipeline = load_saved_pipeline()
 if "chat_engine" not in st.session_state:
-    st.session_state.chat_engine = None
+    st.session_state.chat_engine = (
+        ChatEngine(st.session_state.rag_pipeline)
+        if st.session_state.rag_pipeline is not None
+        else None
+    )
 if "chat_history" not in st.session_state:
     st.session_state.chat_history = []
 if "sources_ingested" not in st.session_state:
-    st.session_state.sources_ingested = []
+    st.session_state.sources_ingested = (
+        st.session_state.rag_pipeline.get_all_sources()
+        if st.session_state.rag_pipeline is not None
+        else []
+    )
+if "rejected_pages" not in st.session_state:
+    st.session_state.rejected_pages = []
 
 # Header
 st.markdown(
@@ -89,6 +177,14 @@ with st.sidebar:
         label_visibility="collapsed",
     )
 
+    st.markdown("**Or poll RSS/Atom feeds and sitemaps** (one per line)")
+    feeds_input = st.text_area(
+        "Feeds",
+        height=80,
+        placeholder="https://example.com/rss.xml\nhttps://example.com/news-sitemap.xml",
+        label_visibility="collapsed",
+    )
+
     col1, col2 = st.columns(2)
     with col1:
         scrape_button = st.button("🔍 Scrape & Ingest", use_container_width=True)
@@ -97,42 +193,96 @@ with st.sidebar:
 
     # Handle scraping
     if scrape_button:
-        if urls_input.strip():
-            urls = [url.strip() for url in urls_input.split("\n") if url.strip()]
-
-            with st.spinner("Scraping URLs..."):
-                scraper = WebScraper()
-                scraped_data = scraper.scrape_multiple(urls)
+        urls = [url.strip() for url in urls_input.split("\n") if url.strip()]
+        feed_urls = [url.strip() for url in feeds_input.split("\n") if url.strip()]
+
+        # Feeds only contribute articles not handed out by earlier polls
+        if feed_urls:
+            with st.spinner("Polling feeds..."):
+                urls += get_feed_ingester().poll(feed_urls)
+
+        if urls:
+            # Stream results so progress shows as each page finishes
+            progress = st.progress(0.0, text="Scraping URLs...")
+            scraped_data = []
+            for result in get_scraper().scrape_stream(urls):
+                scraped_data.append(result)
+                progress.progress(
+                    len(scraped_data) / len(urls),
+                    text=f"Scraped {len(scraped_data)}/{len(urls)}: {result['url']}",
+                )
+            progress.empty()
 
             # Check for successful scrapes
             successful = [d for d in scraped_data if d["success"]]
 
             if successful:
                 with st.spinner("Building vector store..."):
-                    st.session_state.rag_pipeline = RAGPipeline()
-                    st.session_state.rag_pipeline.ingest_documents(successful)
-                    st.session_state.chat_engine = ChatEngine(
-                        st.session_state.rag_pipeline
-                    )
-                    st.session_state.sources_ingested = (
-                        st.session_state.rag_pipeline.get_all_sources()
+                    pipeline = st.session_state.rag_pipeline
+                    if pipeline is None:
+                        pipeline = RAGPipeline(embedding_cache=get_embedding_cache())
+
+                    embed_progress = st.progress(0.0, text="Embedding chunks...")
+                    pipeline.executor.progress_callback = (
+                        lambda done, total: embed_progress.progress(
+                            done / total, text=f"Embedded {done}/{total} chunks"
+                        )
                     )
 
-                st.success(f"✅ Ingested {len(successful)} sources successfully!")
-                st.rerun()
+                    try:
+                        if st.session_state.rag_pipeline is None:
+                            try:
+                                pipeline.ingest_documents(successful)
+                                ingested = True
+                            except ValueError:
+                                ingested = False
+                        else:
+                            # Embed only new articles and edits to known ones
+                            changes = pipeline.refresh_documents(successful)
+                            ingested = changes["added"] or changes["removed"]
+                    finally:
+                        # Queries go through the executor too; don't let them
+                        # drive this run's progress bar
+                        pipeline.executor.progress_callback = None
+                        embed_progress.empty()
+                    # Pages the quality gate kept away from the embedder
+                    st.session_state.rejected_pages = pipeline.quality_gate.rejected
+
+                if ingested:
+                    pipeline = save_pipeline(pipeline, successful)
+                    st.session_state.rag_pipeline = pipeline
+                    if st.session_state.chat_engine is None:
+                        st.session_state.chat_engine = ChatEngine(pipeline)
+                    else:
+                        # Saving may have merged into another session's save
+                        st.session_state.chat_engine.rag_pipeline = pipeline
+                    st.session_state.sources_ingested = pipeline.get_all_sources()
+                    st.success(f"✅ Ingested {len(successful)} sources successfully!")
+                    st.rerun()
+                elif st.session_state.rag_pipeline is not None:
+                    st.info("📭 Nothing new: these articles are already ingested")
+                else:
+                    st.error(
+                        "❌ None of the scraped pages looked like articles."
+                        " See the skipped pages below."
+                    )
             else:
                 st.error(
                     "❌ Failed to scrape any URLs. Check your links and try again."
                 )
+        elif feed_urls:
+            st.info("📭 No new articles in the feeds since the last poll")
         else:
             st.warning("⚠️ Please enter at least one URL")
 
     # Handle clear
     if clear_button:
+        shutil.rmtree(VECTOR_STORE_DIR, ignore_errors=True)
         st.session_state.rag_pipeline = None
         st.session_state.chat_engine = None
         st.session_state.chat_history = []
         st.session_state.sources_ingested = []
+        st.session_state.rejected_pages = []
         st.success("🗑️ Data cleared!")
         st.rerun()
 
@@ -145,6 +295,15 @@ with st.sidebar:
                 st.markdown(f"**Title:** {source['title']}")
                 st.markdown(f"**URL:** [{source['url']}]({source['url']})")
 
+    # Show pages rejected by the quality gate
+    if st.session_state.rejected_pages:
+        st.divider()
+        st.subheader("🚫 Skipped Pages")
+        for page in st.session_state.rejected_pages:
+            with st.expander(f"⚠️ {page['title'] or page['url']}"):
+                st.markdown(f"**Reason:** {page['reason']}")
+                st.markdown(f"**URL:** [{page['url']}]({page['url']})")
+
 # Main content area
 if st.session_state.chat_engine is None:
     # Welcome screen
@@ -0,0 +1,71 @@
+"""
+Extractor tests: selectors learned per site on benchmark_sites/ find the
+article again while parsing only its container
+"""
+
+from pathlib import Path
+
+import pytest
+
+from backend.extractor import ContentExtractor, STRATEGIES
+from backend.selector_cache import SelectorCache
+
+SITES = Path(__file__).parent / "benchmark_sites"
+
+
+def site_pages():
+    """(site, html, expected text) for every fixture page"""
+    return [
+        (path.parent.name, path.read_text(encoding="utf-8"), path.with_suffix(".txt"))
+        for path in sorted(SITES.rglob("*.html"))
+    ]
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_selectors_are_learned_per_site(tmp_path, strategy):
+    extractor = ContentExtractor(strategy=strategy)
+    cache = SelectorCache(str(tmp_path / "selectors.json"))
+    for site, html, _ in site_pages():
+        selector = cache.get(site)
+        cache.record(
+            site, extractor.extract(html, selector=selector)["selector"], selector
+        )
+
+    sites = {site for site, _, _ in site_pages()}
+    assert all(cache.get(site) for site in sites)
+    # Only the first min_pages pages of each site went the generic way
+    stats = cache.stats()
+    assert stats["misses"] == 0
+    assert stats["hits"] == len(site_pages()) - cache.min_pages * len(sites)
+
+
+@pytest.mark.parametrize(
+    "site, selector",
+    [
+        ("thecourier.example", "div.article-content.story"),
+        ("valleypost.example", "div#story"),
+        ("metrowire.example", "article"),
+    ],
+)
+def test_selector_parses_only_the_container(site, selector):
+    path = SITES / site / "story0.html"
+    html = path.read_text(encoding="utf-8")
+    extractor = ContentExtractor()
+
+    soup = extractor.parse(html, selector=selector)
+    assert soup.select_one(selector) is not None
+    assert soup.find("nav") is None and soup.find("footer") is None
+
+    result = extractor.extract(html, selector=selector)
+    assert result["selector"] == selector
+    assert result["content"] == path.with_suffix(".txt").read_text("utf-8").strip()
+
+
+def test_restricted_parse_keeps_content_class_divs():
+    html = (
+        "<html><body><div class='promo'><p>Subscribe now</p></div>"
+        "<div class='post-content'><p>Story text</p></div></body></html>"
+    )
+    soup = ContentExtractor(restrict=True).parse(html)
+    assert soup.find("div", class_="post-content") is not None
+    assert soup.find("div", class_="promo") is None
@@ -0,0 +1,124 @@
+"""
+Quality gate tests: real articles pass, junk pages are rejected with a reason
+"""
+
+import pytest
+
+from backend.quality import QualityGate
+
+COUNCIL_BRIEF = (
+    "The city council voted on Tuesday to replace the parking permit website"
+    " after residents reported months of page not found errors when they tried"
+    " to renew. The new system will be built by the council's own digital team"
+    " and should be ready by the spring. Officials said the old contract had"
+    " cost more than expected, and that permits which expired during the outage"
+    " will be honoured until the end of the year."
+)
+
+REJECTED = {
+    "fallback": (
+        "Could not extract content from this page.",
+        "boilerplate: 'could not extract content from this page'",
+    ),
+    "cookie wall": (
+        "We use cookies to give you the best experience on our website and to"
+        " show you relevant ads. You can accept all cookies or manage cookie"
+        " settings to choose which ones we use. Read our privacy policy to"
+        " learn more about how we and our partners use your data.",
+        "boilerplate: 'we use cookies'",
+    ),
+    "paywall": (
+        "Subscribe to continue reading. This article is for subscribers only."
+        " Already a subscriber? Sign in to your account to keep reading our"
+        " award-winning journalism, or start a free trial today.",
+        "boilerplate: 'subscribe to continue reading'",
+    ),
+    "error page": (
+        "Page not found. Sorry, this page does not exist or may have been moved."
+        " Check the address or return to the homepage.",
+        "boilerplate: 'page not found'",
+    ),
+    "navigation": (
+        "Home News World Business Markets Technology Science Health Sport"
+        " Football Tennis Cricket Culture Film Music Books Travel Weather"
+        " Podcasts Video Newsletters Opinion Editorials Letters Obituaries"
+        " Crosswords Puzzles Horoscopes Classifieds Jobs Property Motors"
+        " Archive Contact Careers Advertise Privacy Terms Accessibility Help",
+        "low stopword ratio: 0.00",
+    ),
+}
+
+RUSSIAN = (
+    "Городской совет во вторник одобрил новый бюджет после долгих обсуждений."
+    " Депутаты согласились увеличить расходы на ремонт дорог и школ, а также"
+    " выделить средства на строительство нового парка в северной части города."
+    " Мэр заявил, что работы начнутся весной и завершатся до конца следующего"
+    " года, если подрядчики не задержат поставки материалов."
+)
+
+CHINESE = (
+    "市议会周二在经过长时间讨论后批准了新的预算。议员们同意增加道路和学校维修的支出，"
+    "并拨款在城市北部建设一个新公园。市长表示，工程将于春季开始，如果承包商不推迟材料供应，"
+    "将在明年年底前完成。居民们普遍欢迎这一决定，但也有人担心施工期间的交通问题。"
+    "议会还决定成立一个委员会，负责监督工程进度并定期向公众报告。"
+    "委员会成员包括议员、工程师和居民代表，他们将每月举行一次会议，讨论工程中出现的问题，"
+    "并在网站上公布会议记录。市政府还承诺，如果工程超出预算，将在下一次议会会议上说明原因。"
+)
+
+SPANISH = (
+    "El ayuntamiento aprobó el martes el nuevo presupuesto después de un largo"
+    " debate. Los concejales acordaron aumentar el gasto en la reparación de"
+    " calles y escuelas, y destinar fondos para la construcción de un nuevo"
+    " parque en el norte de la ciudad. El alcalde dijo que las obras empezarán"
+    " en primavera y terminarán antes de que acabe el año próximo."
+)
+
+
+def check(content: str, **options):
+    """Rejection reason for a page with this content"""
+    return QualityGate(**options).check({"content": content})
+
+
+@pytest.mark.parametrize("name", REJECTED)
+def test_junk_pages_are_rejected(name):
+    content, reason = REJECTED[name]
+    assert check(content) == reason
+
+
+def test_article_mentioning_a_boilerplate_phrase_passes():
+    assert check(COUNCIL_BRIEF) is None
+
+
+def test_non_latin_scripts_pass_on_length():
+    assert check(RUSSIAN) is None
+    assert check(CHINESE) is None
+
+
+def test_language_allow_list():
+    assert check(COUNCIL_BRIEF, languages=["en"]) is None
+    assert check(SPANISH, languages=["en"]) == "language: es"
+    assert check(RUSSIAN, languages=["en"]) == "language: unsupported script"
+
+
+def test_filter_records_reasons():
+    gate = QualityGate()
+    pages = [
+        {
+            "url": "https://example.com/brief",
+            "title": "Brief",
+            "content": COUNCIL_BRIEF,
+        },
+        {
+            "url": "https://example.com/404",
+            "title": "404",
+            "content": REJECTED["error page"][0],
+        },
+    ]
+    assert gate.filter(pages) == pages[:1]
+    assert gate.rejected == [
+        {
+            "url": "https://example.com/404",
+            "title": "404",
+            "reason": "boilerplate: 'page not found'",
+        }
+    ]
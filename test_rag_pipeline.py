@@ -0,0 +1,145 @@
+"""
+RAG pipeline tests with a fake embedder (no Ollama needed)
+"""
+
+import random
+from typing import List
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from backend.rag_pipeline import RAGPipeline, StaleSaveError
+
+VOCAB = [f"word{i}" for i in range(2000)]
+
+
+class CountingEmbedding(DeterministicFakeEmbedding):
+    """Fake embedder that records every text it embeds"""
+
+    embedded: List[str] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.embedded.extend(texts)
+        return super().embed_documents(texts)
+
+
+def make_pipeline() -> RAGPipeline:
+    """Pipeline with a fake embedder and no quality gate"""
+    pipeline = RAGPipeline()
+    pipeline.embeddings = CountingEmbedding(size=16)
+    pipeline.quality_gate.filter = lambda articles: articles
+    return pipeline
+
+
+def article(number: int, paragraphs: int = 4) -> dict:
+    """Scrape result with random paragraphs"""
+    rnd = random.Random(number)
+    content = "\n\n".join(" ".join(rnd.choices(VOCAB, k=60)) for _ in range(paragraphs))
+    return {
+        "url": f"https://site{number % 3}.com/story{number}",
+        "title": f"Story {number}",
+        "source_name": f"site{number % 3}.com",
+        "content": content,
+        "success": True,
+    }
+
+
+def test_save_load_round_trip(tmp_path):
+    saved = make_pipeline()
+    saved.ingest_documents([article(i) for i in range(10)])
+    saved.save(str(tmp_path))
+
+    loaded = make_pipeline()
+    loaded.load(str(tmp_path))
+    assert [doc.page_content for doc in loaded.documents] == [
+        doc.page_content for doc in saved.documents
+    ]
+    assert loaded.get_all_sources() == saved.get_all_sources()
+
+    query = "word1 word2 word3"
+    assert [doc.id for doc in loaded.retrieve_relevant_chunks(query)] == [
+        doc.metadata["chunk_id"] for doc in saved.retrieve_relevant_chunks(query)
+    ]
+
+
+def test_add_documents_embeds_only_new_articles():
+    pipeline = make_pipeline()
+    existing = [article(i, paragraphs=2) for i in range(50)]
+    pipeline.ingest_documents(existing)
+    pipeline.embeddings.embedded.clear()
+
+    new = [article(i, paragraphs=2) for i in range(100, 105)]
+    duplicate = dict(
+        existing[0], url="https://mirror.com/copy", source_name="mirror.com"
+    )
+    assert pipeline.add_documents(new + [duplicate] + existing[1:3]) == 5
+
+    new_urls = {data["url"] for data in new}
+    new_chunks = [
+        doc.page_content
+        for doc in pipeline.documents
+        if doc.metadata["url"] in new_urls
+    ]
+    assert sorted(pipeline.embeddings.embedded) == sorted(new_chunks)
+    assert pipeline.vector_store.index.ntotal == len(pipeline.documents)
+
+
+def test_refresh_embeds_only_edited_chunks():
+    pipeline = make_pipeline()
+    articles = [article(i, paragraphs=8) for i in range(5)]
+    pipeline.ingest_documents(articles)
+    pipeline.embeddings.embedded.clear()
+
+    assert pipeline.refresh_documents(articles)["added"] == 0
+    assert pipeline.embeddings.embedded == []
+
+    paragraphs = articles[2]["content"].split("\n\n")
+    paragraphs[-1] = "word7 " * 60
+    edited = dict(articles[2], content="\n\n".join(paragraphs))
+    counts = pipeline.refresh_documents([edited])
+    assert counts["added"] == len(pipeline.embeddings.embedded) >= 1
+    assert counts["unchanged"] >= 1
+    assert pipeline.vector_store.index.ntotal == len(pipeline.documents)
+
+
+def test_loaded_pipeline_can_change_and_save_again(tmp_path):
+    first = make_pipeline()
+    articles = [article(i, paragraphs=8) for i in range(5)]
+    first.ingest_documents(articles)
+    first.save(str(tmp_path))
+
+    loaded = make_pipeline()
+    loaded.load(str(tmp_path))
+    duplicate = dict(
+        articles[0], url="https://mirror.com/copy", source_name="mirror.com"
+    )
+    loaded.add_documents([duplicate, article(20)])
+    loaded.refresh_documents([dict(articles[1], content=article(21)["content"])])
+    assert loaded.vector_store.index.ntotal == len(loaded.documents)
+    loaded.save(str(tmp_path))
+
+    reloaded = make_pipeline()
+    reloaded.load(str(tmp_path))
+    assert len(reloaded.documents) == reloaded.vector_store.index.ntotal
+    assert article(20)["url"] in reloaded.article_metadata
+    # The duplicate was merged into the original article and its chunks
+    assert "https://mirror.com/copy" in reloaded.documents[0].metadata["urls"]
+
+
+def test_save_refuses_to_overwrite_a_newer_save(tmp_path):
+    base = make_pipeline()
+    base.ingest_documents([article(i) for i in range(3)])
+    base.save(str(tmp_path))
+
+    session_a, session_b = make_pipeline(), make_pipeline()
+    session_a.load(str(tmp_path))
+    session_b.load(str(tmp_path))
+    session_a.add_documents([article(30)])
+    session_a.save(str(tmp_path))
+
+    session_b.add_documents([article(40)])
+    with pytest.raises(StaleSaveError):
+        session_b.save(str(tmp_path))
+
+    # Session B's view still works after A's save removed its generation
+    assert session_b.retrieve_relevant_chunks("word5")